@@ -596,14 +596,31 @@ class MessageListModel(QAbstractListModel):
 
     def remove_message(self, item_id: str):
         """Remove a message."""
-        idx = self._message_map.get(item_id)
-        if idx is not None:
-            del self._messages[idx]
-            del self._message_map[item_id]
-            # Rebuild map for shifted indices
-            for i, msg in enumerate(self._messages[idx:], start=idx):
-                self._message_map[msg.item_id] = i
-            self._apply_filter()
+        self.remove_messages([item_id])
+
+    def remove_messages(self, item_ids: list[str]):
+        """Remove several messages, emitting one row removal per contiguous run."""
+        ids = set(item_ids) & self._message_map.keys()
+        if not ids:
+            return
+
+        self._messages = [msg for msg in self._messages if msg.item_id not in ids]
+        self._message_map = {msg.item_id: i for i, msg in enumerate(self._messages)}
+
+        # Group the affected filtered rows into contiguous [start, end] runs
+        runs = []
+        for row, msg in enumerate(self._filtered_messages):
+            if msg.item_id in ids:
+                if runs and runs[-1][1] == row - 1:
+                    runs[-1][1] = row
+                else:
+                    runs.append([row, row])
+
+        # Remove bottom-up so earlier row numbers stay valid
+        for start, end in reversed(runs):
+            self.beginRemoveRows(QModelIndex(), start, end)
+            del self._filtered_messages[start:end + 1]
+            self.endRemoveRows()
 
     def sync_incrementally(self, messages_data: list[dict]) -> tuple[int, int]:
         """Sync messages incrementally - add new, remove deleted, update existing.
@@ -1323,6 +1340,7 @@ class MailbenchWindow(QMainWindow):
         self._messages_by_id: dict[str, dict] = {}
         self._current_message_full_data: Optional[dict] = None
         self._message_windows: list[MessageWindow] = []
+        self._account_dialog = None  # Built on first use, then reused
 
         # Theme setting - always light mode for now
         self._theme_setting = "Light"
@@ -1370,6 +1388,13 @@ class MailbenchWindow(QMainWindow):
         self._refresh_timer.start(10000)  # 10 seconds
         self._refresh_count = 0  # Counter for periodic folder sync
 
+        # Database housekeeping (WAL checkpoint + ANALYZE) every 5 minutes
+        self._db_maintenance_timer = QTimer(self)
+        self._db_maintenance_timer.timeout.connect(
+            lambda: self.sync_manager.executor.submit(self.db.maintenance)
+        )
+        self._db_maintenance_timer.start(300000)  # 5 minutes
+
     @Slot(object)
     def _execute_callback(self, callback):
         """Execute a callback on the main thread."""
@@ -2258,13 +2283,14 @@ class MailbenchWindow(QMainWindow):
         def do_connect():
             try:
                 self.kerio_pool.connect(account_id, config)
-                self.after(0, lambda: self._on_connected(account_id, account['email'], True, None))
+                self.after(0, lambda: self._on_connected(account_id, account['email'], True, None, account))
             except Exception as e:
-                self.after(0, lambda: self._on_connected(account_id, account['email'], False, str(e)))
+                self.after(0, lambda: self._on_connected(account_id, account['email'], False, str(e), account))
 
         threading.Thread(target=do_connect, daemon=True).start()
 
-    def _on_connected(self, account_id: int, email: str, success: bool, error: str):
+    def _on_connected(self, account_id: int, email: str, success: bool, error: str,
+                      account: dict = None):
         """Handle connection result."""
         if success:
             self.connected_accounts.add(account_id)
@@ -2273,9 +2299,11 @@ class MailbenchWindow(QMainWindow):
             session = self.kerio_pool.get_session(account_id)
             if session and session.config.display_name:
                 display_name = session.config.display_name
-                # Update account name in database
-                account = self.db.get_account(account_id)
-                if account:
+                # Reuse the row _connect_account already loaded
+                if account is None:
+                    account = self.db.get_account(account_id)
+                # Update account name in database (only when it changed)
+                if account and account['name'] != display_name:
                     self.db.save_account(
                         name=display_name,
                         email=account['email'],
@@ -2391,10 +2419,12 @@ class MailbenchWindow(QMainWindow):
                     })
             # Also add cached emails from sent messages
             cached = self.db.get_cached_emails()
+            known = {a['email'].lower() for a in self._address_book}
             for entry in cached:
                 email = entry.get('email', '')
                 # Check if already in address book
-                if email and not any(a['email'].lower() == email.lower() for a in self._address_book):
+                if email and email.lower() not in known:
+                    known.add(email.lower())
                     self._address_book.append({
                         'name': entry.get('name', ''),
                         'email': email,
@@ -2927,10 +2957,12 @@ class MailbenchWindow(QMainWindow):
         """Format file size in human-readable form."""
         if size_bytes < 1024:
             return f"{size_bytes} B"
-        elif size_bytes < 1024 * 1024:
-            return f"{size_bytes / 1024:.1f} KB"
-        else:
-            return f"{size_bytes / (1024 * 1024):.1f} MB"
+        # Integer tenths of a unit, rounded, avoids float division per card
+        if size_bytes < 1 << 20:
+            whole, frac = divmod((size_bytes * 10 + 512) >> 10, 10)
+            return f"{whole}.{frac} KB"
+        whole, frac = divmod((size_bytes * 10 + (1 << 19)) >> 20, 10)
+        return f"{whole}.{frac} MB"
 
     def _show_attachments(self, attachments: list):
         """Show attachments in preview header with card-style display."""
@@ -3090,7 +3122,7 @@ class MailbenchWindow(QMainWindow):
             if msg.exec() != QMessageBox.StandardButton.Yes:
                 return
 
-        full_url = f"https://{session.config.server}{url}"
+        full_url = session.host_url + url
         self._open_attachment(full_url, name, session)
 
     def _get_default_downloads_dir(self) -> str:
@@ -3139,7 +3171,7 @@ class MailbenchWindow(QMainWindow):
 
         save_path, _ = QFileDialog.getSaveFileName(self, "Save Attachment", default_path)
         if save_path:
-            full_url = f"https://{session.config.server}{url}"
+            full_url = session.host_url + url
             self._save_attachment(full_url, save_path, session)
 
     def _get_attachment_warning(self, filename: str) -> tuple[bool, str]:
@@ -3222,7 +3254,7 @@ class MailbenchWindow(QMainWindow):
             QMessageBox.StandardButton.Open | QMessageBox.StandardButton.Save | QMessageBox.StandardButton.Cancel
         )
 
-        full_url = f"https://{session.config.server}{url}"
+        full_url = session.host_url + url
 
         if result == QMessageBox.StandardButton.Open:
             self._open_attachment(full_url, name, session)
@@ -3237,16 +3269,11 @@ class MailbenchWindow(QMainWindow):
         """Download attachment to temp file and open."""
         def do_open():
             try:
-                import requests
-                cookies = {session.cookie_name: session.cookie_value} if hasattr(session, 'cookie_name') else {}
-                headers = {"X-Token": session.token} if hasattr(session, 'token') else {}
-
-                response = requests.get(url, cookies=cookies, headers=headers, verify=True, timeout=60)
-                response.raise_for_status()
+                content = session.download(url)
 
                 _, ext = os.path.splitext(filename)
                 with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as f:
-                    f.write(response.content)
+                    f.write(content)
                     temp_path = f.name
 
                 system = platform.system()
@@ -3268,15 +3295,10 @@ class MailbenchWindow(QMainWindow):
         """Save attachment to file."""
         def do_save():
             try:
-                import requests
-                cookies = {session.cookie_name: session.cookie_value} if hasattr(session, 'cookie_name') else {}
-                headers = {"X-Token": session.token} if hasattr(session, 'token') else {}
-
-                response = requests.get(url, cookies=cookies, headers=headers, verify=True, timeout=60)
-                response.raise_for_status()
+                content = session.download(url)
 
                 with open(save_path, 'wb') as f:
-                    f.write(response.content)
+                    f.write(content)
 
                 self.after(0, lambda p=save_path: self._statusbar.showMessage(f"Saved: {p}"))
             except Exception as e:
@@ -3443,28 +3465,36 @@ class MailbenchWindow(QMainWindow):
             self._pending_read_item_id = None
             self._skip_auto_mark_read = True
 
+        item_ids = []
         for index in self._message_list.selectedIndexes():
             msg: MessageData = index.data(Qt.ItemDataRole.DisplayRole)
             if msg:
                 self._message_model.update_message(msg.item_id, is_read=is_read)
-                self.sync_manager.mark_as_read(
-                    self._current_account_id, msg.item_id, is_read,
-                    callback=lambda s, e: None
-                )
+                item_ids.append(msg.item_id)
+
+        if item_ids:
+            self.sync_manager.mark_messages_read(
+                self._current_account_id, item_ids, is_read,
+                callback=lambda s, e: None
+            )
 
     def _toggle_flag_selected(self, flagged: bool):
         """Toggle flag on selected messages."""
         if not self._current_account_id:
             return
 
+        item_ids = []
         for index in self._message_list.selectedIndexes():
             msg: MessageData = index.data(Qt.ItemDataRole.DisplayRole)
             if msg:
                 self._message_model.update_message(msg.item_id, is_flagged=flagged)
-                self.sync_manager.set_flag(
-                    self._current_account_id, msg.item_id, flagged,
-                    callback=lambda s, e: None
-                )
+                item_ids.append(msg.item_id)
+
+        if item_ids:
+            self.sync_manager.set_flags(
+                self._current_account_id, item_ids, flagged,
+                callback=lambda s, e: None
+            )
 
     def _on_flag_clicked(self, item_id: str, flagged: bool):
         """Handle flag icon click from delegate."""
@@ -3670,65 +3700,36 @@ class MailbenchWindow(QMainWindow):
         if not messages_to_delete:
             return
 
-        # Show progress dialog for multiple messages
-        if count > 1:
-            progress = QProgressDialog("Deleting messages...", "Cancel", 0, count, self)
-            progress.setWindowTitle("Delete")
-            progress.setWindowModality(Qt.WindowModality.WindowModal)
-            progress.setMinimumDuration(0)
-            progress.setValue(0)
-        else:
-            progress = None
-
-        deleted_count = [0]  # Use list to allow modification in nested function
-        cancelled = [False]
-
-        def on_deleted(success, error, item_id):
-            if cancelled[0]:
-                return
+        self._statusbar.showMessage(f"Deleting {len(messages_to_delete)} message(s)...")
 
-            if progress and progress.wasCanceled():
-                cancelled[0] = True
-                if progress:
-                    progress.close()
-                self._message_list.setFocus()
+        def on_deleted(success, error, item_ids):
+            if not success:
+                self._statusbar.showMessage(f"Delete failed: {error}")
                 return
 
-            deleted_count[0] += 1
-
-            if success:
-                self._message_model.remove_message(item_id)
-                if item_id in self._messages_by_id:
-                    del self._messages_by_id[item_id]
+            self._message_model.remove_messages(item_ids)
+            for item_id in item_ids:
+                self._messages_by_id.pop(item_id, None)
+            self._statusbar.showMessage(f"Deleted {len(item_ids)} message(s)")
 
-            if progress:
-                progress.setValue(deleted_count[0])
-
-            # All done?
-            if deleted_count[0] >= count:
-                if progress:
-                    progress.close()
-
-                # Select next message
-                row_count = self._message_model.rowCount()
-                if row_count > 0:
-                    new_row = min(max(0, next_row), row_count - 1)
-                    new_index = self._message_model.index(new_row)
-                    self._message_list.setCurrentIndex(new_index)
-                    self._on_message_clicked(new_index)
-                else:
-                    self._current_message_id = None
-                    self._clear_preview()
+            # Select next message
+            row_count = self._message_model.rowCount()
+            if row_count > 0:
+                new_row = min(max(0, next_row), row_count - 1)
+                new_index = self._message_model.index(new_row)
+                self._message_list.setCurrentIndex(new_index)
+                self._on_message_clicked(new_index)
+            else:
+                self._current_message_id = None
+                self._clear_preview()
 
-                self._message_list.setFocus()
+            self._message_list.setFocus()
 
-        # Start deletions
-        for item_id in messages_to_delete:
-            self.sync_manager.delete_message(
-                self._current_account_id,
-                item_id,
-                callback=lambda s, e, iid=item_id: on_deleted(s, e, iid)
-            )
+        self.sync_manager.delete_messages(
+            self._current_account_id,
+            messages_to_delete,
+            callback=on_deleted
+        )
 
     def _on_message_deleted(self, success: bool, error: str, item_id: str, select_row: int = -1):
         """Handle message deletion."""
@@ -3835,20 +3836,26 @@ class MailbenchWindow(QMainWindow):
 
     def _add_account(self):
         """Add new account."""
-        from mailbench.dialogs.dialogs import AccountDialog
-        dialog = AccountDialog(self, self.db, self.kerio_pool, app=self)
-        dialog.exec()
+        self._get_account_dialog().exec()
         self._refresh_accounts()
         self._message_list.setFocus()
 
     def _manage_accounts(self):
         """Manage accounts."""
-        from mailbench.dialogs.dialogs import AccountDialog
-        dialog = AccountDialog(self, self.db, self.kerio_pool, app=self)
-        dialog.exec()
+        self._get_account_dialog().exec()
         self._refresh_accounts()
         self._message_list.setFocus()
 
+    def _get_account_dialog(self):
+        """Return the account dialog, building its widgets only once."""
+        if self._account_dialog is None:
+            from mailbench.dialogs.dialogs import AccountDialog
+            self._account_dialog = AccountDialog(self, self.db, self.kerio_pool, app=self)
+        else:
+            self._account_dialog.status_label.setText("")
+            self._account_dialog._load_accounts()
+        return self._account_dialog
+
     def _refresh_accounts(self):
         """Refresh account list after changes."""
         # Clear and reload
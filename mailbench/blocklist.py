@@ -86,12 +86,13 @@ class BlocklistManager:
         """Initialize allowed domains list with defaults if empty."""
         existing = self.db.get_allowed_domains()
         if not existing:
-            # Add default domains
-            for domain in DEFAULT_ALLOWED_DOMAINS:
-                self.db.add_allowed_domain(domain)
-            # Add user's own domain
-            if self._user_domain:
-                self.db.add_allowed_domain(self._user_domain)
+            with self.db.transaction():
+                # Add default domains
+                for domain in DEFAULT_ALLOWED_DOMAINS:
+                    self.db.add_allowed_domain(domain)
+                # Add user's own domain
+                if self._user_domain:
+                    self.db.add_allowed_domain(self._user_domain)
 
     def _load_from_server(self, callback: Optional[Callable] = None):
         """Load blocklist from server Note into local DB."""
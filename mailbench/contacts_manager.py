@@ -40,18 +40,19 @@ class ContactsManager:
                     callback(False, error, [])
                 return
 
-            # Clear existing folders
-            self.db.clear_contact_folders(self._account_id)
-
-            # Save new folders
-            for folder in folders:
-                self.db.save_contact_folder(
-                    account_id=self._account_id,
-                    folder_id=folder.get("folder_id", ""),
-                    name=folder.get("name", ""),
-                    parent_id=folder.get("parent_id"),
-                    is_default=folder.get("is_default", False)
-                )
+            with self.db.transaction():
+                # Clear existing folders
+                self.db.clear_contact_folders(self._account_id)
+
+                # Save new folders
+                for folder in folders:
+                    self.db.save_contact_folder(
+                        account_id=self._account_id,
+                        folder_id=folder.get("folder_id", ""),
+                        name=folder.get("name", ""),
+                        parent_id=folder.get("parent_id"),
+                        is_default=folder.get("is_default", False)
+                    )
 
             self._folders_loaded = True
 
@@ -73,41 +74,42 @@ class ContactsManager:
                     callback(False, error, [])
                 return
 
-            # Clear existing contacts for this folder
-            self.db.clear_contacts(self._account_id, folder_id)
-
-            # Save new contacts
-            for contact in contacts:
-                # Convert lists to JSON strings for storage
-                emails_json = json.dumps(contact.get("email_addresses", []))
-                phones_json = json.dumps(contact.get("phone_numbers", []))
-                home_addr = contact.get("home_address")
-                work_addr = contact.get("work_address")
-                home_addr_json = json.dumps(home_addr) if home_addr else None
-                work_addr_json = json.dumps(work_addr) if work_addr else None
-
-                self.db.save_contact(
-                    account_id=self._account_id,
-                    folder_id=folder_id,
-                    item_id=contact.get("item_id", ""),
-                    common_name=contact.get("common_name"),
-                    first_name=contact.get("first_name"),
-                    last_name=contact.get("last_name"),
-                    nickname=contact.get("nickname"),
-                    title=contact.get("title"),
-                    company=contact.get("company"),
-                    job_title=contact.get("job_title"),
-                    department=contact.get("department"),
-                    email_addresses=emails_json,
-                    phone_numbers=phones_json,
-                    home_address=home_addr_json,
-                    work_address=work_addr_json,
-                    website=contact.get("website"),
-                    birthday=contact.get("birthday"),
-                    anniversary=contact.get("anniversary"),
-                    notes=contact.get("notes"),
-                    photo_url=contact.get("photo_url")
-                )
+            with self.db.transaction():
+                # Clear existing contacts for this folder
+                self.db.clear_contacts(self._account_id, folder_id)
+
+                # Save new contacts
+                for contact in contacts:
+                    # Convert lists to JSON strings for storage
+                    emails_json = json.dumps(contact.get("email_addresses", []))
+                    phones_json = json.dumps(contact.get("phone_numbers", []))
+                    home_addr = contact.get("home_address")
+                    work_addr = contact.get("work_address")
+                    home_addr_json = json.dumps(home_addr) if home_addr else None
+                    work_addr_json = json.dumps(work_addr) if work_addr else None
+
+                    self.db.save_contact(
+                        account_id=self._account_id,
+                        folder_id=folder_id,
+                        item_id=contact.get("item_id", ""),
+                        common_name=contact.get("common_name"),
+                        first_name=contact.get("first_name"),
+                        last_name=contact.get("last_name"),
+                        nickname=contact.get("nickname"),
+                        title=contact.get("title"),
+                        company=contact.get("company"),
+                        job_title=contact.get("job_title"),
+                        department=contact.get("department"),
+                        email_addresses=emails_json,
+                        phone_numbers=phones_json,
+                        home_address=home_addr_json,
+                        work_address=work_addr_json,
+                        website=contact.get("website"),
+                        birthday=contact.get("birthday"),
+                        anniversary=contact.get("anniversary"),
+                        notes=contact.get("notes"),
+                        photo_url=contact.get("photo_url")
+                    )
 
             if callback:
                 callback(True, None, contacts)
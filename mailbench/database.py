@@ -2,7 +2,10 @@
 
 import json
 import os
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 
 try:
@@ -13,8 +16,50 @@ except ImportError:
     KEYRING_AVAILABLE = False
     KeyringError = Exception  # Fallback for type hints
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 KEYRING_SERVICE = "mailbench"
 
+# STRICT tables (SQLite 3.37+) store declared types natively and reject
+# mistyped values; older SQLite builds get an ordinary table
+STRICT_TABLE = " STRICT" if sqlite3.sqlite_version_info >= (3, 37, 0) else ""
+
+# Bump whenever _init_db changes so existing databases rerun it
+SCHEMA_VERSION = 4
+
+# Chunk size for "IN (?, ?, ...)" lists, below SQLite's bound-variable limit
+MAX_SQL_VARIABLES = 500
+
+# Applied to every connection when it is opened
+CONNECTION_PRAGMAS = (
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -64000",  # 64 MB page cache
+    "PRAGMA mmap_size = 268435456",  # read pages through a 256 MB memory map
+    "PRAGMA busy_timeout = 5000",
+)
+
+# Applied only to the writer connection
+WRITER_PRAGMAS = (
+    # WAL lets the UI read while the sync thread writes; journal_mode is
+    # persistent in the file, synchronous has to be set per connection
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA foreign_keys = ON",
+    # Keep the WAL file bounded in long-running sessions
+    "PRAGMA wal_autocheckpoint = 1000",
+    "PRAGMA journal_size_limit = 67108864",
+)
+
+
+def _json_dumps(value):
+    """Serialize a JSON column value, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value)
+
 
 def _is_installed():
     """Check if running as an installed package (pipx/pip) vs development."""
@@ -47,13 +92,100 @@ class Database:
             db_path = data_dir / "mailbench.db"
 
         self.db_path = db_path
+        # One long-lived writer connection shared by the UI and sync threads;
+        # the lock serializes access to it. Reads go through a pool of
+        # read-only connections, which WAL lets run alongside the writer.
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._writer_thread = None
+        self._passwords = {}  # email -> keyring password cache
+        # get_accounts rows, dropped after any write to the accounts table;
+        # the generation stops a read that raced a write from caching stale rows
+        self._accounts_cache = None
+        self._accounts_gen = 0
+        self._accounts_pending = False  # accounts written in a not-yet-committed transaction
+        self.conn = self._connect()
+        self._readers = queue.SimpleQueue()
         self._init_db()
 
+    def _connect(self, read_only=False):
+        """Open and configure a connection."""
+        # Larger statement cache: connections live for the whole session and
+        # re-run the same queries, so keep their compiled forms around
+        if read_only:
+            uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=256)
+        else:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        if not read_only:
+            for pragma in WRITER_PRAGMAS:
+                conn.execute(pragma)
+        return conn
+
+    @contextmanager
     def _get_conn(self):
-        return sqlite3.connect(self.db_path)
+        """Hold the writer connection; commit on success, roll back on error.
+
+        Nested uses (inside transaction()) leave committing to the outermost block.
+        """
+        with self._lock:
+            outermost = self._depth == 0
+            self._depth += 1
+            if outermost:
+                self._writer_thread = threading.get_ident()
+            try:
+                yield self.conn
+            except BaseException:
+                if outermost:
+                    self.conn.rollback()
+                raise
+            else:
+                if outermost:
+                    self.conn.commit()
+            finally:
+                self._depth -= 1
+                if outermost:
+                    self._writer_thread = None
+                    if self._accounts_pending:
+                        # Other threads may have cached pre-commit rows meanwhile
+                        self._accounts_pending = False
+                        self._forget_accounts()
+
+    @contextmanager
+    def _read_conn(self):
+        """Borrow a read-only connection so reads don't wait on the writer."""
+        if self._writer_thread == threading.get_ident():
+            # Inside a write on this thread: read through the writer so
+            # uncommitted changes are visible
+            with self._get_conn() as conn:
+                yield conn
+            return
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            conn = self._connect(read_only=True)
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextmanager
+    def transaction(self):
+        """Group several Database calls into a single commit."""
+        with self._get_conn() as conn:
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            yield conn
 
     def _init_db(self):
         with self._get_conn() as conn:
+            # Schema is already current; skip the DDL below
+            if conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+                return
+
             # Settings table (key-value store)
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS settings (
@@ -129,9 +261,43 @@ class Database:
                 )
             """)
 
+            # Covering index for the message list query so get_messages can be
+            # answered from the index alone; supersedes idx_messages_folder
+            conn.execute("DROP INDEX IF EXISTS idx_messages_folder")
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_messages_folder_covering
+                ON messages(account_id, folder_id, date_received DESC, item_id, subject,
+                            sender_name, sender_email, recipients, is_read, has_attachments,
+                            importance, body_preview, is_flagged)
+            """)
+
+            # Message bodies, kept out of the messages table so list queries
+            # don't page through large HTML (messages.body/body_type are legacy)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS message_bodies (
+                    message_id INTEGER PRIMARY KEY,
+                    body TEXT,
+                    body_type TEXT,
+                    FOREIGN KEY (message_id) REFERENCES messages(id) ON DELETE CASCADE
+                )
+            """)
+
+            # Move bodies cached before the split
             conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_messages_folder
-                ON messages(account_id, folder_id, date_received DESC)
+                INSERT OR IGNORE INTO message_bodies (message_id, body, body_type)
+                SELECT id, body, body_type FROM messages WHERE body IS NOT NULL
+            """)
+            conn.execute("UPDATE messages SET body = NULL WHERE body IS NOT NULL")
+
+            # Nothing searches messages yet; don't make every message write
+            # maintain a full-text index (databases from schema 3 had one)
+            for trigger in ("messages_fts_insert", "messages_fts_delete", "messages_fts_update"):
+                conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            conn.execute("DROP TABLE IF EXISTS messages_fts")
+
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_folders_account
+                ON folders(account_id, name)
             """)
 
             conn.execute("""
@@ -139,6 +305,23 @@ class Database:
                 ON messages(conversation_id)
             """)
 
+            # Normalized To/Cc recipients, so "messages to X" is an index lookup
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS message_recipients (
+                    message_id INTEGER NOT NULL,
+                    kind TEXT NOT NULL,
+                    email TEXT NOT NULL COLLATE NOCASE,
+                    name TEXT,
+                    PRIMARY KEY (message_id, kind, email),
+                    FOREIGN KEY (message_id) REFERENCES messages(id) ON DELETE CASCADE
+                ){STRICT_TABLE}
+            """)
+
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_message_recipients_email
+                ON message_recipients(email)
+            """)
+
             # Attachments metadata
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS attachments (
@@ -154,6 +337,11 @@ class Database:
                 )
             """)
 
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_attachments_message
+                ON attachments(message_id)
+            """)
+
             # Contact folders
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS contact_folders (
@@ -291,6 +479,11 @@ class Database:
                 )
             """)
 
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_calendar_account
+                ON calendar_events(account_id, start_time)
+            """)
+
             # Saved view state
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS saved_state (
@@ -360,29 +553,55 @@ class Database:
                 )
             """)
 
-            conn.commit()
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def maintenance(self):
+        """Truncate the WAL and refresh query planner statistics."""
+        with self._get_conn() as conn:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            # Sample rather than scan every row so this stays quick
+            conn.execute("PRAGMA analysis_limit = 400")
+            conn.execute("ANALYZE")
 
     # ==================== Settings ====================
 
     def get_setting(self, key, default=None):
-        with self._get_conn() as conn:
+        with self._read_conn() as conn:
             cursor = conn.execute("SELECT value FROM settings WHERE key = ?", (key,))
             row = cursor.fetchone()
             return row[0] if row else default
 
+    def get_settings(self, keys):
+        """Get several settings in one query; missing keys are omitted."""
+        keys = list(keys)
+        if not keys:
+            return {}
+        placeholders = ",".join("?" * len(keys))
+        with self._read_conn() as conn:
+            cursor = conn.execute(
+                f"SELECT key, value FROM settings WHERE key IN ({placeholders})", keys
+            )
+            return {row[0]: row[1] for row in cursor.fetchall()}
+
+    _SET_SETTING_SQL = (
+        "INSERT INTO settings (key, value) VALUES (?, ?) "
+        "ON CONFLICT(key) DO UPDATE SET value = excluded.value"
+    )
+
     def set_setting(self, key, value):
         with self._get_conn() as conn:
-            conn.execute(
-                "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
-                (key, value)
-            )
-            conn.commit()
+            conn.execute(self._SET_SETTING_SQL, (key, value))
+
+    def set_settings(self, items):
+        """Write several settings in one transaction."""
+        with self._get_conn() as conn:
+            conn.executemany(self._SET_SETTING_SQL, list(items.items()))
 
     # ==================== Trusted Senders ====================
 
     def is_trusted_sender(self, email: str) -> bool:
         """Check if a sender's email is in the trusted list."""
-        with self._get_conn() as conn:
+        with self._read_conn() as conn:
             cursor = conn.execute(
                 "SELECT 1 FROM trusted_senders WHERE email = ? COLLATE NOCASE",
                 (email,)
@@ -396,7 +615,6 @@ class Database:
                 "INSERT OR IGNORE INTO trusted_senders (email) VALUES (?)",
                 (email,)
             )
-            conn.commit()
 
     def remove_trusted_sender(self, email: str):
         """Remove a sender from the trusted list."""
@@ -405,11 +623,10 @@ class Database:
                 "DELETE FROM trusted_senders WHERE email = ? COLLATE NOCASE",
                 (email,)
             )
-            conn.commit()
 
     def get_trusted_senders(self) -> list:
         """Get all trusted sender emails."""
-        with self._get_conn() as conn:
+        with self._read_conn() as conn:
             cursor = conn.execute("SELECT email FROM trusted_senders ORDER BY email")
             return [row[0] for row in cursor.fetchall()]
 
@@ -417,7 +634,6 @@ class Database:
         """Clear all trusted senders (used before syncing from server)."""
         with self._get_conn() as conn:
             conn.execute("DELETE FROM trusted_senders")
-            conn.commit()
 
     def bulk_add_trusted_senders(self, emails: list):
         """Bulk add trusted senders from server sync.
@@ -433,25 +649,40 @@ class Database:
                     "INSERT OR IGNORE INTO trusted_senders (email) VALUES (?)",
                     (email,)
                 )
-            conn.commit()
 
     # ==================== Accounts ====================
 
     def get_accounts(self):
         """Get all accounts (without passwords)."""
-        with self._get_conn() as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute("""
-                SELECT id, name, email, server, username, auth_type, ews_url,
-                       autodiscover, sync_interval, is_default, display_order, last_sync
-                FROM accounts ORDER BY display_order, name
-            """)
-            return [dict(row) for row in cursor.fetchall()]
+        cached = self._accounts_cache
+        if cached is None:
+            gen = self._accounts_gen
+            with self._read_conn() as conn:
+                cursor = conn.execute("""
+                    SELECT id, name, email, server, username, auth_type, ews_url,
+                           autodiscover, sync_interval, is_default, display_order, last_sync
+                    FROM accounts ORDER BY display_order, name
+                """)
+                cached = tuple(dict(row) for row in cursor.fetchall())
+            # Rows read inside this thread's open write may never be committed
+            if gen == self._accounts_gen and self._writer_thread != threading.get_ident():
+                self._accounts_cache = cached
+        # Callers may edit what they get back, so hand out copies
+        return [dict(account) for account in cached]
+
+    def _forget_accounts(self):
+        """Drop the cached get_accounts rows after an accounts write.
+
+        Inside an open transaction, drop them again once it commits or rolls back.
+        """
+        self._accounts_gen += 1
+        self._accounts_cache = None
+        if self._depth:
+            self._accounts_pending = True
 
     def get_account(self, account_id):
         """Get a single account by ID (includes password from keyring)."""
-        with self._get_conn() as conn:
-            conn.row_factory = sqlite3.Row
+        with self._read_conn() as conn:
             cursor = conn.execute("""
                 SELECT id, name, email, server, username, auth_type, ews_url,
                        autodiscover, sync_interval, is_default, display_order, last_sync
@@ -467,8 +698,7 @@ class Database:
 
     def get_account_by_name(self, name):
         """Get a single account by name (includes password from keyring)."""
-        with self._get_conn() as conn:
-            conn.row_factory = sqlite3.Row
+        with self._read_conn() as conn:
             cursor = conn.execute("""
                 SELECT id, name, email, server, username, auth_type, ews_url,
                        autodiscover, sync_interval, is_default, display_order, last_sync
@@ -482,6 +712,10 @@ class Database:
             account['password'] = self._get_password(account['email'])
             return account
 
+    def get_account_password(self, email):
+        """Get an account's password from the OS keyring."""
+        return self._get_password(email)
+
     def save_account(self, name, email, server, username, password, auth_type='basic',
                      ews_url=None, autodiscover=False, sync_interval=300, is_default=False,
                      display_order=0, account_id=None):
@@ -507,7 +741,7 @@ class Database:
                     VALUES (?, ?, ?, ?, '', ?, ?, ?, ?, ?, ?)
                 """, (name, email, server, username, auth_type, ews_url,
                       1 if autodiscover else 0, sync_interval, 1 if is_default else 0, display_order))
-            conn.commit()
+        self._forget_accounts()
 
     def delete_account(self, account_id):
         """Delete an account and all associated data."""
@@ -518,7 +752,7 @@ class Database:
 
         with self._get_conn() as conn:
             conn.execute("DELETE FROM accounts WHERE id = ?", (account_id,))
-            conn.commit()
+        self._forget_accounts()
 
     def update_last_sync(self, account_id):
         """Update the last_sync timestamp for an account."""
@@ -527,7 +761,7 @@ class Database:
                 "UPDATE accounts SET last_sync = CURRENT_TIMESTAMP WHERE id = ?",
                 (account_id,)
             )
-            conn.commit()
+        self._forget_accounts()
 
     # ==================== Keyring Helpers ====================
 
@@ -535,11 +769,15 @@ class Database:
         """Get password from OS keyring."""
         if not KEYRING_AVAILABLE:
             raise RuntimeError("Keyring not available. Install 'keyring' package and ensure a keyring backend is running (gnome-keyring, kwallet, etc.)")
+        # Keyring lookups can go over D-Bus; remember them for the session
+        if email in self._passwords:
+            return self._passwords[email]
         try:
-            password = keyring.get_password(KEYRING_SERVICE, email)
-            return password or ""
+            password = keyring.get_password(KEYRING_SERVICE, email) or ""
         except KeyringError as e:
             raise RuntimeError(f"Failed to access keyring: {e}")
+        self._passwords[email] = password
+        return password
 
     def _set_password(self, email, password):
         """Store password in OS keyring."""
@@ -548,10 +786,13 @@ class Database:
         try:
             keyring.set_password(KEYRING_SERVICE, email, password)
         except KeyringError as e:
+            self._passwords.pop(email, None)
             raise RuntimeError(f"Failed to store password in keyring: {e}")
+        self._passwords[email] = password
 
     def _delete_password(self, email):
         """Delete password from OS keyring."""
+        self._passwords.pop(email, None)
         if not KEYRING_AVAILABLE:
             return
         try:
@@ -570,7 +811,6 @@ class Database:
 
         migrated = 0
         with self._get_conn() as conn:
-            conn.row_factory = sqlite3.Row
             # Check if password column exists and has data
             try:
                 cursor = conn.execute("SELECT id, email, password FROM accounts WHERE password IS NOT NULL AND password != ''")
@@ -586,23 +826,20 @@ class Database:
                     try:
                         # Store in keyring
                         keyring.set_password(KEYRING_SERVICE, email, password)
+                        self._passwords[email] = password
                         # Clear from database
                         conn.execute("UPDATE accounts SET password = '' WHERE id = ?", (row['id'],))
                         migrated += 1
                     except KeyringError:
                         pass  # Leave password in DB if keyring fails
 
-            if migrated > 0:
-                conn.commit()
-
         return migrated
 
     # ==================== Folders ====================
 
     def get_folders(self, account_id):
         """Get all folders for an account."""
-        with self._get_conn() as conn:
-            conn.row_factory = sqlite3.Row
+        with self._read_conn() as conn:
             cursor = conn.execute("""
                 SELECT id, folder_id, name, parent_id, folder_type, unread_count, total_count
                 FROM folders WHERE account_id = ? ORDER BY name
@@ -611,7 +848,7 @@ class Database:
 
     def get_folder_type(self, account_id, folder_id):
         """Get the type of a folder (inbox, sent, drafts, trash, junk, etc.)."""
-        with self._get_conn() as conn:
+        with self._read_conn() as conn:
             cursor = conn.execute("""
                 SELECT folder_type FROM folders WHERE account_id = ? AND folder_id = ?
             """, (account_id, folder_id))
@@ -623,11 +860,17 @@ class Database:
         """Save or update a folder."""
         with self._get_conn() as conn:
             conn.execute("""
-                INSERT OR REPLACE INTO folders
+                INSERT INTO folders
                     (account_id, folder_id, name, parent_id, folder_type, unread_count, total_count, sync_state)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(account_id, folder_id) DO UPDATE SET
+                    name = excluded.name,
+                    parent_id = excluded.parent_id,
+                    folder_type = excluded.folder_type,
+                    unread_count = excluded.unread_count,
+                    total_count = excluded.total_count,
+                    sync_state = excluded.sync_state
             """, (account_id, folder_id, name, parent_id, folder_type, unread_count, total_count, sync_state))
-            conn.commit()
 
     def update_folder_counts(self, account_id, folder_id, unread_count, total_count):
         """Update folder message counts."""
@@ -636,59 +879,140 @@ class Database:
                 UPDATE folders SET unread_count = ?, total_count = ?
                 WHERE account_id = ? AND folder_id = ?
             """, (unread_count, total_count, account_id, folder_id))
-            conn.commit()
+
+    def update_folders(self, account_id, folders):
+        """Bring an account's folders in line with a full server listing.
+
+        Only rows that are new or whose fields changed are written, and
+        folders missing from the listing are deleted.
+        """
+        rows = [
+            (f["folder_id"], f["name"], f.get("parent_id"), f.get("folder_type"),
+             f.get("unread_count", 0), f.get("total_count", 0))
+            for f in folders
+        ]
+        with self._get_conn() as conn:
+            existing = {
+                row[0]: tuple(row)
+                for row in conn.execute("""
+                    SELECT folder_id, name, parent_id, folder_type, unread_count, total_count
+                    FROM folders WHERE account_id = ?
+                """, (account_id,))
+            }
+            changed = [(account_id,) + row for row in rows if existing.get(row[0]) != row]
+            if changed:
+                conn.executemany("""
+                    INSERT INTO folders
+                        (account_id, folder_id, name, parent_id, folder_type, unread_count, total_count)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(account_id, folder_id) DO UPDATE SET
+                        name = excluded.name,
+                        parent_id = excluded.parent_id,
+                        folder_type = excluded.folder_type,
+                        unread_count = excluded.unread_count,
+                        total_count = excluded.total_count
+                """, changed)
+            gone = existing.keys() - {row[0] for row in rows}
+            if gone:
+                conn.executemany(
+                    "DELETE FROM folders WHERE account_id = ? AND folder_id = ?",
+                    [(account_id, folder_id) for folder_id in gone]
+                )
 
     def clear_folders(self, account_id):
         """Clear all folders for an account."""
         with self._get_conn() as conn:
             conn.execute("DELETE FROM folders WHERE account_id = ?", (account_id,))
-            conn.commit()
 
     # ==================== Messages ====================
 
     def get_messages(self, account_id, folder_id, limit=100, offset=0):
         """Get messages from a folder."""
-        with self._get_conn() as conn:
-            conn.row_factory = sqlite3.Row
-            if limit is None or limit < 0:
-                cursor = conn.execute("""
-                    SELECT id, item_id, subject, sender_name, sender_email, recipients,
-                           date_received, is_read, has_attachments, importance, body_preview, is_flagged
-                    FROM messages
-                    WHERE account_id = ? AND folder_id = ?
-                    ORDER BY date_received DESC
-                """, (account_id, folder_id))
-            else:
-                cursor = conn.execute("""
-                    SELECT id, item_id, subject, sender_name, sender_email, recipients,
-                           date_received, is_read, has_attachments, importance, body_preview, is_flagged
-                    FROM messages
-                    WHERE account_id = ? AND folder_id = ?
-                    ORDER BY date_received DESC
-                    LIMIT ? OFFSET ?
-                """, (account_id, folder_id, limit, offset))
+        # A single statement text (LIMIT -1 means no limit in SQLite) keeps
+        # this query in the statement cache
+        if limit is None or limit < 0:
+            limit = -1
+        with self._read_conn() as conn:
+            cursor = conn.execute("""
+                SELECT id, item_id, subject, sender_name, sender_email, recipients,
+                       date_received, is_read, has_attachments, importance, body_preview, is_flagged
+                FROM messages
+                WHERE account_id = ? AND folder_id = ?
+                ORDER BY date_received DESC
+                LIMIT ? OFFSET ?
+            """, (account_id, folder_id, limit, offset or 0))
             return [dict(row) for row in cursor.fetchall()]
 
+    # Every messages column except the legacy body/body_type, which live in message_bodies
+    _MESSAGE_COLUMNS = """
+        m.id, m.account_id, m.folder_id, m.item_id, m.change_key, m.conversation_id,
+        m.subject, m.sender_name, m.sender_email, m.recipients, m.cc,
+        m.date_received, m.date_sent, m.size, m.importance, m.is_read,
+        m.has_attachments, m.body_preview, m.categories, m.is_flagged, m.cached_at,
+        b.body, b.body_type
+    """
+
     def get_message(self, message_id):
         """Get a single message by ID (includes body)."""
-        with self._get_conn() as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute("""
-                SELECT * FROM messages WHERE id = ?
+        with self._read_conn() as conn:
+            cursor = conn.execute(f"""
+                SELECT {self._MESSAGE_COLUMNS}
+                FROM messages m LEFT JOIN message_bodies b ON b.message_id = m.id
+                WHERE m.id = ?
             """, (message_id,))
             row = cursor.fetchone()
             return dict(row) if row else None
 
     def get_message_by_item_id(self, item_id):
         """Get a message by EWS item ID."""
-        with self._get_conn() as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute("""
-                SELECT * FROM messages WHERE item_id = ?
+        with self._read_conn() as conn:
+            cursor = conn.execute(f"""
+                SELECT {self._MESSAGE_COLUMNS}
+                FROM messages m LEFT JOIN message_bodies b ON b.message_id = m.id
+                WHERE m.item_id = ?
             """, (item_id,))
             row = cursor.fetchone()
             return dict(row) if row else None
 
+    _SAVE_MESSAGE_SQL = """
+        INSERT INTO messages
+            (account_id, folder_id, item_id, change_key, conversation_id,
+             subject, sender_name, sender_email, recipients, cc,
+             date_received, date_sent, size, importance, is_read,
+             has_attachments, body_preview, categories, is_flagged)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(item_id) DO UPDATE SET
+            folder_id = excluded.folder_id,
+            change_key = excluded.change_key,
+            subject = excluded.subject,
+            sender_name = excluded.sender_name,
+            sender_email = excluded.sender_email,
+            recipients = excluded.recipients,
+            cc = excluded.cc,
+            date_received = excluded.date_received,
+            is_read = excluded.is_read,
+            has_attachments = excluded.has_attachments,
+            body_preview = COALESCE(messages.body_preview, excluded.body_preview)
+    """
+
+    @staticmethod
+    def _message_params(account_id, folder_id, item_id, change_key=None,
+                        conversation_id=None, subject=None, sender_name=None,
+                        sender_email=None, recipients=None, cc=None,
+                        date_received=None, date_sent=None, size=None,
+                        importance='normal', is_read=False, has_attachments=False,
+                        body_preview=None, body_type=None, body=None,
+                        categories=None, is_flagged=False):
+        """Build the parameter tuple for _SAVE_MESSAGE_SQL."""
+        return (account_id, folder_id, item_id, change_key, conversation_id,
+                subject, sender_name, sender_email,
+                _json_dumps(recipients) if recipients else None,
+                _json_dumps(cc) if cc else None,
+                date_received, date_sent, size, importance, 1 if is_read else 0,
+                1 if has_attachments else 0, body_preview,
+                _json_dumps(categories) if categories else None,
+                1 if is_flagged else 0)
+
     def save_message(self, account_id, folder_id, item_id, change_key=None,
                      conversation_id=None, subject=None, sender_name=None,
                      sender_email=None, recipients=None, cc=None,
@@ -697,46 +1021,84 @@ class Database:
                      body_preview=None, body_type=None, body=None,
                      categories=None, is_flagged=False):
         """Save or update a message."""
-        recipients_json = json.dumps(recipients) if recipients else None
-        cc_json = json.dumps(cc) if cc else None
-        categories_json = json.dumps(categories) if categories else None
+        self.save_messages([dict(
+            account_id=account_id, folder_id=folder_id, item_id=item_id,
+            change_key=change_key, conversation_id=conversation_id, subject=subject,
+            sender_name=sender_name, sender_email=sender_email, recipients=recipients,
+            cc=cc, date_received=date_received, date_sent=date_sent, size=size,
+            importance=importance, is_read=is_read, has_attachments=has_attachments,
+            body_preview=body_preview, body_type=body_type, body=body,
+            categories=categories, is_flagged=is_flagged,
+        )])
+
+    def save_messages(self, messages):
+        """Save or update many messages in one transaction.
+
+        messages: list of dicts using save_message's keyword arguments
+        """
+        params = [self._message_params(**msg) for msg in messages]
+        if not params:
+            return
+        body_rows = [
+            (msg['body'], msg.get('body_type'), msg['item_id'])
+            for msg in messages if msg.get('body') is not None
+        ]
+        recipient_rows = [
+            (kind, email, name, msg['item_id'])
+            for msg in messages
+            for kind in ('to', 'cc')
+            for email, name in self._recipient_pairs(msg.get('recipients' if kind == 'to' else 'cc'))
+        ]
+        with self._get_conn() as conn:
+            conn.executemany(self._SAVE_MESSAGE_SQL, params)
+            # OR IGNORE preserves a body that is already cached
+            conn.executemany("""
+                INSERT OR IGNORE INTO message_bodies (message_id, body, body_type)
+                SELECT id, ?, ? FROM messages WHERE item_id = ?
+            """, body_rows)
+            conn.executemany("""
+                DELETE FROM message_recipients
+                WHERE message_id = (SELECT id FROM messages WHERE item_id = ?)
+            """, [(p[2],) for p in params])
+            conn.executemany("""
+                INSERT OR IGNORE INTO message_recipients (message_id, kind, email, name)
+                SELECT id, ?, ?, ? FROM messages WHERE item_id = ?
+            """, recipient_rows)
+
+    @staticmethod
+    def _recipient_pairs(recipients):
+        """Yield (email, name) from a list of address strings or dicts."""
+        for recipient in recipients or ():
+            if isinstance(recipient, dict):
+                email = recipient.get('email') or recipient.get('address')
+                name = recipient.get('name')
+            else:
+                email, name = recipient, None
+            if email:
+                yield email.strip(), name
 
-        with self._get_conn() as conn:
-            # Use ON CONFLICT to preserve body if it already exists
-            conn.execute("""
-                INSERT INTO messages
-                    (account_id, folder_id, item_id, change_key, conversation_id,
-                     subject, sender_name, sender_email, recipients, cc,
-                     date_received, date_sent, size, importance, is_read,
-                     has_attachments, body_preview, body_type, body, categories, is_flagged)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(item_id) DO UPDATE SET
-                    folder_id = excluded.folder_id,
-                    change_key = excluded.change_key,
-                    subject = excluded.subject,
-                    sender_name = excluded.sender_name,
-                    sender_email = excluded.sender_email,
-                    recipients = excluded.recipients,
-                    cc = excluded.cc,
-                    date_received = excluded.date_received,
-                    is_read = excluded.is_read,
-                    has_attachments = excluded.has_attachments,
-                    body_preview = COALESCE(messages.body_preview, excluded.body_preview)
-            """, (account_id, folder_id, item_id, change_key, conversation_id,
-                  subject, sender_name, sender_email, recipients_json, cc_json,
-                  date_received, date_sent, size, importance, 1 if is_read else 0,
-                  1 if has_attachments else 0, body_preview, body_type, body,
-                  categories_json, 1 if is_flagged else 0))
-            conn.commit()
+    def get_messages_by_recipient(self, account_id, email):
+        """Get messages sent To/Cc an address, newest first."""
+        with self._read_conn() as conn:
+            cursor = conn.execute("""
+                SELECT DISTINCT m.id, m.item_id, m.folder_id, m.subject, m.sender_name,
+                       m.sender_email, m.date_received, m.is_read
+                FROM message_recipients r
+                JOIN messages m ON m.id = r.message_id
+                WHERE r.email = ? AND m.account_id = ?
+                ORDER BY m.date_received DESC
+            """, (email, account_id))
+            return [dict(row) for row in cursor.fetchall()]
 
     def update_message_body(self, message_id, body, body_type='html'):
         """Update message body (for lazy loading)."""
         with self._get_conn() as conn:
-            conn.execute(
-                "UPDATE messages SET body = ?, body_type = ? WHERE id = ?",
-                (body, body_type, message_id)
-            )
-            conn.commit()
+            conn.execute("""
+                INSERT INTO message_bodies (message_id, body, body_type) VALUES (?, ?, ?)
+                ON CONFLICT(message_id) DO UPDATE SET
+                    body = excluded.body,
+                    body_type = excluded.body_type
+            """, (message_id, body, body_type))
 
     def update_message_read(self, message_id, is_read):
         """Update message read status."""
@@ -745,7 +1107,6 @@ class Database:
                 "UPDATE messages SET is_read = ? WHERE id = ?",
                 (1 if is_read else 0, message_id)
             )
-            conn.commit()
 
     def update_message_flagged(self, message_id, is_flagged):
         """Update message flagged status."""
@@ -754,13 +1115,42 @@ class Database:
                 "UPDATE messages SET is_flagged = ? WHERE id = ?",
                 (1 if is_flagged else 0, message_id)
             )
-            conn.commit()
 
     def delete_message(self, message_id):
         """Delete a message from cache."""
         with self._get_conn() as conn:
             conn.execute("DELETE FROM messages WHERE id = ?", (message_id,))
-            conn.commit()
+
+    def update_messages_read(self, item_ids, is_read):
+        """Update read status for several messages by server item ID."""
+        self._update_messages_column("is_read", item_ids, 1 if is_read else 0)
+
+    def update_messages_flagged(self, item_ids, is_flagged):
+        """Update flagged status for several messages by server item ID."""
+        self._update_messages_column("is_flagged", item_ids, 1 if is_flagged else 0)
+
+    def _update_messages_column(self, column, item_ids, value):
+        """Set one status column on many messages with as few statements as possible."""
+        item_ids = list(item_ids)
+        with self._get_conn() as conn:
+            for start in range(0, len(item_ids), MAX_SQL_VARIABLES):
+                chunk = item_ids[start:start + MAX_SQL_VARIABLES]
+                placeholders = ",".join("?" * len(chunk))
+                conn.execute(
+                    f"UPDATE messages SET {column} = ? WHERE item_id IN ({placeholders})",
+                    (value, *chunk)
+                )
+
+    def delete_messages_by_item_id(self, item_ids):
+        """Delete several messages from cache by server item ID."""
+        item_ids = list(item_ids)
+        with self._get_conn() as conn:
+            for start in range(0, len(item_ids), MAX_SQL_VARIABLES):
+                chunk = item_ids[start:start + MAX_SQL_VARIABLES]
+                placeholders = ",".join("?" * len(chunk))
+                conn.execute(
+                    f"DELETE FROM messages WHERE item_id IN ({placeholders})", chunk
+                )
 
     def clear_messages(self, account_id, folder_id=None):
         """Clear cached messages for an account (optionally by folder)."""
@@ -772,11 +1162,10 @@ class Database:
                 )
             else:
                 conn.execute("DELETE FROM messages WHERE account_id = ?", (account_id,))
-            conn.commit()
 
     def get_message_count(self, account_id, folder_id):
         """Get count of cached messages in a folder."""
-        with self._get_conn() as conn:
+        with self._read_conn() as conn:
             cursor = conn.execute(
                 "SELECT COUNT(*) FROM messages WHERE account_id = ? AND folder_id = ?",
                 (account_id, folder_id)
@@ -787,8 +1176,7 @@ class Database:
 
     def get_attachments(self, message_id):
         """Get attachments for a message."""
-        with self._get_conn() as conn:
-            conn.row_factory = sqlite3.Row
+        with self._read_conn() as conn:
             cursor = conn.execute("""
                 SELECT id, attachment_id, name, content_type, size, is_inline, content_id
                 FROM attachments WHERE message_id = ?
@@ -805,7 +1193,6 @@ class Database:
                 VALUES (?, ?, ?, ?, ?, ?, ?)
             """, (message_id, attachment_id, name, content_type, size,
                   1 if is_inline else 0, content_id))
-            conn.commit()
 
     # ==================== View State ====================
 
@@ -820,12 +1207,10 @@ class Database:
                     (view_type, account_id, folder_id, selected_message_id, scroll_position)
                 VALUES (?, ?, ?, ?, ?)
             """, (view_type, account_id, folder_id, selected_message_id, scroll_position))
-            conn.commit()
 
     def get_view_state(self, view_type):
         """Get saved view state."""
-        with self._get_conn() as conn:
-            conn.row_factory = sqlite3.Row
+        with self._read_conn() as conn:
             cursor = conn.execute("""
                 SELECT account_id, folder_id, selected_message_id, scroll_position
                 FROM saved_state WHERE view_type = ?
@@ -867,12 +1252,10 @@ class Database:
                         name = COALESCE(excluded.name, email_cache.name),
                         last_used = CURRENT_TIMESTAMP
                 """, (email, name))
-            conn.commit()
 
     def get_cached_emails(self):
         """Get all cached email addresses, sorted by send_count descending."""
-        with self._get_conn() as conn:
-            conn.row_factory = sqlite3.Row
+        with self._read_conn() as conn:
             cursor = conn.execute("""
                 SELECT email, name, send_count
                 FROM email_cache
@@ -882,8 +1265,7 @@ class Database:
 
     def get_unique_senders_from_messages(self):
         """Get unique sender emails from messages table for cache building."""
-        with self._get_conn() as conn:
-            conn.row_factory = sqlite3.Row
+        with self._read_conn() as conn:
             cursor = conn.execute("""
                 SELECT DISTINCT sender_email, sender_name
                 FROM messages
@@ -896,26 +1278,22 @@ class Database:
 
         emails: list of (email, name) tuples
         """
+        rows = [(email.strip().lower(), name) for email, name in emails
+                if email and email.strip()]
+        if not rows:
+            return
         with self._get_conn() as conn:
-            for email, name in emails:
-                if not email:
-                    continue
-                email = email.strip().lower()
-                if not email:
-                    continue
-                # Only insert if not exists, don't update existing
-                conn.execute("""
-                    INSERT OR IGNORE INTO email_cache (email, name, send_count, last_used)
-                    VALUES (?, ?, 0, CURRENT_TIMESTAMP)
-                """, (email, name))
-            conn.commit()
+            # Only insert if not exists, don't update existing
+            conn.executemany("""
+                INSERT OR IGNORE INTO email_cache (email, name, send_count, last_used)
+                VALUES (?, ?, 0, CURRENT_TIMESTAMP)
+            """, rows)
 
     # ==================== Blocklist ====================
 
     def get_blocked_domains(self) -> list:
         """Get all blocked domains."""
-        with self._get_conn() as conn:
-            conn.row_factory = sqlite3.Row
+        with self._read_conn() as conn:
             cursor = conn.execute("""
                 SELECT id, domain, blocked_count, last_blocked, added_at
                 FROM blocked_domains
@@ -925,8 +1303,7 @@ class Database:
 
     def get_blocked_emails(self) -> list:
         """Get all blocked email addresses."""
-        with self._get_conn() as conn:
-            conn.row_factory = sqlite3.Row
+        with self._read_conn() as conn:
             cursor = conn.execute("""
                 SELECT id, email, blocked_count, last_blocked, added_at
                 FROM blocked_emails
@@ -945,7 +1322,6 @@ class Database:
                     INSERT INTO blocked_domains (domain)
                     VALUES (?)
                 """, (domain,))
-                conn.commit()
                 return True
             except sqlite3.IntegrityError:
                 return False
@@ -961,7 +1337,6 @@ class Database:
                     INSERT INTO blocked_emails (email)
                     VALUES (?)
                 """, (email,))
-                conn.commit()
                 return True
             except sqlite3.IntegrityError:
                 return False
@@ -973,7 +1348,6 @@ class Database:
                 "DELETE FROM blocked_domains WHERE domain = ? COLLATE NOCASE",
                 (domain,)
             )
-            conn.commit()
 
     def remove_blocked_email(self, email: str):
         """Remove an email from blocklist."""
@@ -982,7 +1356,6 @@ class Database:
                 "DELETE FROM blocked_emails WHERE email = ? COLLATE NOCASE",
                 (email,)
             )
-            conn.commit()
 
     def is_blocked(self, sender_email: str) -> tuple[bool, str]:
         """Check if a sender is blocked (by email or domain).
@@ -994,7 +1367,7 @@ class Database:
         sender_email = sender_email.strip().lower()
 
         # Check email first (more specific)
-        with self._get_conn() as conn:
+        with self._read_conn() as conn:
             cursor = conn.execute(
                 "SELECT 1 FROM blocked_emails WHERE email = ? COLLATE NOCASE",
                 (sender_email,)
@@ -1025,14 +1398,12 @@ class Database:
                     last_blocked = CURRENT_TIMESTAMP
                 WHERE {column} = ? COLLATE NOCASE
             """, (value,))
-            conn.commit()
 
     def clear_blocklist(self):
         """Clear all blocklist entries (used before syncing from server)."""
         with self._get_conn() as conn:
             conn.execute("DELETE FROM blocked_domains")
             conn.execute("DELETE FROM blocked_emails")
-            conn.commit()
 
     def bulk_add_blocked_domains(self, entries: list):
         """Bulk add blocked domains from server sync.
@@ -1049,7 +1420,6 @@ class Database:
                     (domain, blocked_count, last_blocked)
                     VALUES (?, ?, ?)
                 """, (domain, entry.get('blocked_count', 0), entry.get('last_blocked')))
-            conn.commit()
 
     def bulk_add_blocked_emails(self, entries: list):
         """Bulk add blocked emails from server sync.
@@ -1066,14 +1436,12 @@ class Database:
                     (email, blocked_count, last_blocked)
                     VALUES (?, ?, ?)
                 """, (email, entry.get('blocked_count', 0), entry.get('last_blocked')))
-            conn.commit()
 
     # ==================== Allowed Domains ====================
 
     def get_allowed_domains(self) -> list:
         """Get all allowed domains (cannot be blocked at domain level)."""
-        with self._get_conn() as conn:
-            conn.row_factory = sqlite3.Row
+        with self._read_conn() as conn:
             cursor = conn.execute("""
                 SELECT id, domain, added_at
                 FROM allowed_domains
@@ -1092,7 +1460,6 @@ class Database:
                     INSERT INTO allowed_domains (domain)
                     VALUES (?)
                 """, (domain,))
-                conn.commit()
                 return True
             except sqlite3.IntegrityError:
                 return False
@@ -1104,14 +1471,13 @@ class Database:
                 "DELETE FROM allowed_domains WHERE domain = ? COLLATE NOCASE",
                 (domain,)
             )
-            conn.commit()
 
     def is_allowed_domain(self, domain: str) -> bool:
         """Check if a domain is in the allowed list."""
         if not domain:
             return False
         domain = domain.strip().lower()
-        with self._get_conn() as conn:
+        with self._read_conn() as conn:
             cursor = conn.execute(
                 "SELECT 1 FROM allowed_domains WHERE domain = ? COLLATE NOCASE",
                 (domain,)
@@ -1122,7 +1488,6 @@ class Database:
         """Clear all allowed domain entries."""
         with self._get_conn() as conn:
             conn.execute("DELETE FROM allowed_domains")
-            conn.commit()
 
     def bulk_add_allowed_domains(self, domains: list):
         """Bulk add allowed domains from server sync."""
@@ -1137,14 +1502,12 @@ class Database:
                     INSERT OR IGNORE INTO allowed_domains (domain)
                     VALUES (?)
                 """, (domain,))
-            conn.commit()
 
     # ==================== Contact Folders ====================
 
     def get_contact_folders(self, account_id: int) -> list:
         """Get all contact folders for an account."""
-        with self._get_conn() as conn:
-            conn.row_factory = sqlite3.Row
+        with self._read_conn() as conn:
             cursor = conn.execute("""
                 SELECT id, folder_id, name, parent_id, is_default
                 FROM contact_folders
@@ -1162,13 +1525,11 @@ class Database:
                     (account_id, folder_id, name, parent_id, is_default)
                 VALUES (?, ?, ?, ?, ?)
             """, (account_id, folder_id, name, parent_id, 1 if is_default else 0))
-            conn.commit()
 
     def clear_contact_folders(self, account_id: int):
         """Clear all contact folders for an account."""
         with self._get_conn() as conn:
             conn.execute("DELETE FROM contact_folders WHERE account_id = ?", (account_id,))
-            conn.commit()
 
     # ==================== Contacts ====================
 
@@ -1214,12 +1575,10 @@ class Database:
                   nickname, title, company, job_title, department, email_addresses,
                   phone_numbers, home_address, work_address, website, birthday,
                   anniversary, notes, photo_url, 1 if is_favorite else 0))
-            conn.commit()
 
     def get_contacts(self, account_id: int, folder_id: str = None) -> list:
         """Get contacts, optionally filtered by folder."""
-        with self._get_conn() as conn:
-            conn.row_factory = sqlite3.Row
+        with self._read_conn() as conn:
             if folder_id:
                 cursor = conn.execute("""
                     SELECT * FROM contacts
@@ -1236,8 +1595,7 @@ class Database:
 
     def get_contact(self, account_id: int, item_id: str) -> dict:
         """Get a single contact by item_id."""
-        with self._get_conn() as conn:
-            conn.row_factory = sqlite3.Row
+        with self._read_conn() as conn:
             cursor = conn.execute("""
                 SELECT * FROM contacts
                 WHERE account_id = ? AND item_id = ?
@@ -1247,8 +1605,7 @@ class Database:
 
     def get_contact_by_id(self, contact_id: int) -> dict:
         """Get a single contact by database id."""
-        with self._get_conn() as conn:
-            conn.row_factory = sqlite3.Row
+        with self._read_conn() as conn:
             cursor = conn.execute("""
                 SELECT * FROM contacts WHERE id = ?
             """, (contact_id,))
@@ -1262,7 +1619,6 @@ class Database:
                 DELETE FROM contacts
                 WHERE account_id = ? AND item_id = ?
             """, (account_id, item_id))
-            conn.commit()
 
     def clear_contacts(self, account_id: int, folder_id: str = None):
         """Clear contacts for an account, optionally by folder."""
@@ -1276,13 +1632,11 @@ class Database:
                 conn.execute("""
                     DELETE FROM contacts WHERE account_id = ?
                 """, (account_id,))
-            conn.commit()
 
     def search_contacts(self, account_id: int, query: str) -> list:
         """Search contacts by name, email, company."""
         query = f"%{query}%"
-        with self._get_conn() as conn:
-            conn.row_factory = sqlite3.Row
+        with self._read_conn() as conn:
             cursor = conn.execute("""
                 SELECT * FROM contacts
                 WHERE account_id = ? AND (
@@ -1311,12 +1665,10 @@ class Database:
                     name = excluded.name,
                     members = excluded.members
             """, (account_id, folder_id, item_id, name, members))
-            conn.commit()
 
     def get_contact_groups(self, account_id: int, folder_id: str = None) -> list:
         """Get contact groups, optionally filtered by folder."""
-        with self._get_conn() as conn:
-            conn.row_factory = sqlite3.Row
+        with self._read_conn() as conn:
             if folder_id:
                 cursor = conn.execute("""
                     SELECT * FROM contact_groups
@@ -1338,7 +1690,6 @@ class Database:
                 DELETE FROM contact_groups
                 WHERE account_id = ? AND item_id = ?
             """, (account_id, item_id))
-            conn.commit()
 
     def clear_contact_groups(self, account_id: int):
         """Clear all contact groups for an account."""
@@ -1346,4 +1697,3 @@ class Database:
             conn.execute("""
                 DELETE FROM contact_groups WHERE account_id = ?
             """, (account_id,))
-            conn.commit()
@@ -1,32 +1,102 @@
 """Qt dialogs for account management and settings."""
 
 import os
+import re
+import threading
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QLineEdit,
-    QPushButton, QListWidget, QGroupBox, QCheckBox, QSpinBox, QFileDialog,
-    QMessageBox, QDialogButtonBox, QComboBox
+    QPushButton, QListView, QGroupBox, QCheckBox, QSpinBox, QFileDialog,
+    QMessageBox, QDialogButtonBox, QComboBox, QDataWidgetMapper
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer, Signal, QAbstractTableModel, QModelIndex
 
 from mailbench.kerio_client import KerioConfig, KerioSession
 
+HOME = os.path.expanduser("~")
+
+
+class AccountTableModel(QAbstractTableModel):
+    """Model over the account rows, one column per editable field."""
+
+    COLUMNS = ('name', 'email', 'server', 'username', 'password', 'is_default')
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.accounts: list[dict] = []
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.accounts)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.accounts):
+            return None
+        if role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return None
+
+        acc = self.accounts[index.row()]
+        key = self.COLUMNS[index.column()]
+        if key == 'password':
+            # Not part of the row; served from the keyring cache on demand
+            try:
+                return self.db.get_account_password(acc['email']) or ''
+            except Exception:
+                return ''
+        if key == 'is_default':
+            return bool(acc.get('is_default'))
+        if key == 'name' and role == Qt.ItemDataRole.DisplayRole and acc.get('is_default'):
+            return f"{acc['name']} (default)"
+        return acc.get(key) or ''
+
+    def set_accounts(self, accounts: list[dict]):
+        """Replace all rows."""
+        self.beginResetModel()
+        self.accounts = accounts
+        self.endResetModel()
+
 
 class AccountDialog(QDialog):
     """Account management dialog."""
 
+    # Emitted from the connection-test thread: (success, message)
+    _test_finished = Signal(bool, str)
+
+    # Form fields that must be filled in: (key, label)
+    _REQUIRED_FIELDS = (
+        ('name', "Account name"),
+        ('email', "Email address"),
+        ('server', "Server"),
+        ('username', "Username"),
+        ('password', "Password"),
+    )
+
+    # Loose shape checks on the stripped text: any host form (localhost, IPv6,
+    # a pasted https:// URL) is left for the connection itself to judge
+    _FIELD_PATTERNS = {
+        'email': re.compile(r"[^@\s]+@[^@\s]+"),
+        'server': re.compile(r"\S+"),
+    }
+
     def __init__(self, parent, db, kerio_pool, app=None, edit_account_id=None):
         super().__init__(parent)
         self.db = db
         self.kerio_pool = kerio_pool
         self.app = app
+        self._reload_app_accounts = getattr(app, '_load_accounts', None)
         self.edit_account_id = edit_account_id
         self._current_account_id = None
-        self._accounts = []
+        self._accounts_model = AccountTableModel(db, self)
+        self._accounts_by_name = {}
 
         self.setWindowTitle("Manage Accounts" if not edit_account_id else "Edit Account")
         self.setMinimumSize(800, 400)
         self.setWindowModality(Qt.WindowModality.WindowModal)
 
+        self._test_finished.connect(self._on_test_finished)
+
         self._create_ui()
         self._load_accounts()
 
@@ -41,8 +111,20 @@ class AccountDialog(QDialog):
         left_group = QGroupBox("Accounts")
         left_layout = QVBoxLayout(left_group)
 
-        self.account_list = QListWidget()
-        self.account_list.itemSelectionChanged.connect(self._on_account_select)
+        # Coalesce rapid selection changes (e.g. holding an arrow key) so the
+        # form is only filled for the row the user settles on
+        self._select_timer = QTimer(self)
+        self._select_timer.setSingleShot(True)
+        self._select_timer.setInterval(50)
+        self._select_timer.timeout.connect(self._on_account_select)
+
+        # View straight over the model; rows are only formatted when painted
+        self.account_list = QListView()
+        self.account_list.setModel(self._accounts_model)
+        self.account_list.setUniformItemSizes(True)
+        self.account_list.selectionModel().currentRowChanged.connect(
+            lambda *_: self._select_timer.start()
+        )
         left_layout.addWidget(self.account_list)
 
         btn_layout = QHBoxLayout()
@@ -97,18 +179,37 @@ class AccountDialog(QDialog):
         right_layout.addWidget(self.default_check, row, 0, 1, 2)
         row += 1
 
+        # Let Qt copy the selected row into the form
+        self._mapper = QDataWidgetMapper(self)
+        self._mapper.setSubmitPolicy(QDataWidgetMapper.SubmitPolicy.ManualSubmit)
+        self._mapper.setModel(self._accounts_model)
+        for column, widget in enumerate((
+            self.name_edit, self.email_edit, self.server_edit,
+            self.username_edit, self.password_edit,
+        )):
+            self._mapper.addMapping(widget, column)
+        self._mapper.addMapping(self.default_check, 5, b"checked")
+
         # Buttons
         btn_layout2 = QHBoxLayout()
-        test_btn = QPushButton("Test Connection")
-        test_btn.clicked.connect(self._test_connection)
-        save_btn = QPushButton("Save")
-        save_btn.clicked.connect(self._save_account)
-        btn_layout2.addWidget(test_btn)
-        btn_layout2.addWidget(save_btn)
+        self.test_btn = QPushButton("Test Connection")
+        self.test_btn.clicked.connect(self._test_connection)
+        self.save_btn = QPushButton("Save")
+        self.save_btn.clicked.connect(self._save_account)
+        btn_layout2.addWidget(self.test_btn)
+        btn_layout2.addWidget(self.save_btn)
         btn_layout2.addStretch()
         right_layout.addLayout(btn_layout2, row, 0, 1, 2)
         row += 1
 
+        # Track empty required fields as they are edited
+        self._invalid = {key for key, _ in self._REQUIRED_FIELDS}
+        self.save_btn.setEnabled(False)
+        for key, _ in self._REQUIRED_FIELDS:
+            getattr(self, f"{key}_edit").textChanged.connect(
+                lambda text, key=key: self._mark(key, text)
+            )
+
         # Status
         self.status_label = QLabel("")
         right_layout.addWidget(self.status_label, row, 0, 1, 2)
@@ -124,47 +225,45 @@ class AccountDialog(QDialog):
         button_layout.addWidget(close_btn)
         main_layout.addLayout(button_layout)
 
-    def _load_accounts(self):
-        """Load accounts into list."""
-        self.account_list.clear()
-        self._accounts = self.db.get_accounts()
+    def _load_accounts(self, accounts=None):
+        """Load accounts into list (pass accounts to skip the query)."""
+        if accounts is None:
+            accounts = self.db.get_accounts()
+        self._accounts_model.set_accounts(accounts)
+        self._accounts_by_name = {acc['name']: acc for acc in accounts}
 
-        for acc in self._accounts:
-            display = acc['name']
-            if acc.get('is_default'):
-                display = f"{display} (default)"
-            self.account_list.addItem(display)
+        if accounts:
+            self.account_list.setCurrentIndex(self._accounts_model.index(0, 0))
+        else:
+            # Nothing to select: don't leave a reused dialog showing the last account
+            self._new_account()
 
-        if self._accounts:
-            self.account_list.setCurrentRow(0)
+    @property
+    def _accounts(self) -> list[dict]:
+        return self._accounts_model.accounts
 
     def _on_account_select(self):
         """Handle account selection."""
-        row = self.account_list.currentRow()
+        row = self.account_list.currentIndex().row()
         if row < 0 or row >= len(self._accounts):
             return
 
+        # Surface keyring errors here; the model itself just shows a blank
+        acc = self._accounts[row]
         try:
-            acc = self.db.get_account(self._accounts[row]['id'])
+            self.db.get_account_password(acc['email'])
         except Exception as e:
             self.status_label.setText(f"Error loading account: {e}")
             self.status_label.setStyleSheet("color: red;")
             return
 
-        if acc:
-            self.name_edit.setText(acc['name'])
-            self.email_edit.setText(acc['email'])
-            self.server_edit.setText(acc['server'])
-            self.username_edit.setText(acc['username'])
-            self.password_edit.setText(acc['password'] or '')
-            self.default_check.setChecked(bool(acc.get('is_default')))
-            self._current_account_id = acc['id']
-        else:
-            self._current_account_id = None
+        self._mapper.setCurrentIndex(row)
+        self._current_account_id = acc['id']
 
     def _new_account(self):
         """Clear form for new account."""
         self.account_list.clearSelection()
+        self._select_timer.stop()
         self.name_edit.clear()
         self.email_edit.clear()
         self.server_edit.clear()
@@ -176,7 +275,7 @@ class AccountDialog(QDialog):
 
     def _delete_account(self):
         """Delete selected account."""
-        row = self.account_list.currentRow()
+        row = self.account_list.currentIndex().row()
         if row < 0 or row >= len(self._accounts):
             return
 
@@ -186,32 +285,46 @@ class AccountDialog(QDialog):
             f"Delete account '{acc['name']}'?\n\nThis will remove all cached messages."
         )
         if result == QMessageBox.StandardButton.Yes:
-            self.db.delete_account(acc['id'])
-            self._load_accounts()
+            # Delete and re-list in one transaction
+            with self.db.transaction():
+                self.db.delete_account(acc['id'])
+                accounts = self.db.get_accounts()
+            self._load_accounts(accounts)
             self._new_account()
             self.status_label.setText("Account deleted")
 
+    def _read_form(self) -> dict:
+        """Read the account form once into a dict of stripped values."""
+        return {
+            'name': self.name_edit.text().strip(),
+            'email': self.email_edit.text().strip(),
+            'server': self.server_edit.text().strip(),
+            'username': self.username_edit.text().strip(),
+            'password': self.password_edit.text(),
+        }
+
+    def _mark(self, key: str, text: str):
+        """Record whether a required field is usable and update the Save button."""
+        filled = text if key == 'password' else text.strip()
+        # A half-typed value (e.g. "user@") does not count as filled in
+        pattern = self._FIELD_PATTERNS.get(key)
+        if filled and (pattern is None or pattern.fullmatch(filled)):
+            self._invalid.discard(key)
+        else:
+            self._invalid.add(key)
+        self.save_btn.setEnabled(not self._invalid)
+
     def _validate(self):
         """Validate form fields."""
-        if not self.name_edit.text().strip():
-            QMessageBox.warning(self, "Validation Error", "Account name is required")
-            return False
-        if not self.email_edit.text().strip():
-            QMessageBox.warning(self, "Validation Error", "Email address is required")
-            return False
-        if not self.server_edit.text().strip():
-            QMessageBox.warning(self, "Validation Error", "Server is required")
-            return False
-        if not self.username_edit.text().strip():
-            QMessageBox.warning(self, "Validation Error", "Username is required")
-            return False
-        if not self.password_edit.text():
-            QMessageBox.warning(self, "Validation Error", "Password is required")
+        if self._invalid:
+            missing = [label for key, label in self._REQUIRED_FIELDS if key in self._invalid]
+            QMessageBox.warning(self, "Validation Error", f"{', '.join(missing)} required")
             return False
         return True
 
     def _test_connection(self):
         """Test connection settings."""
+        fields = self._read_form()
         if not self._validate():
             return
 
@@ -219,63 +332,75 @@ class AccountDialog(QDialog):
         self.status_label.setStyleSheet("")
 
         config = KerioConfig(
-            email=self.email_edit.text().strip(),
-            username=self.username_edit.text().strip(),
-            password=self.password_edit.text(),
-            server=self.server_edit.text().strip()
+            email=fields['email'],
+            username=fields['username'],
+            password=fields['password'],
+            server=fields['server']
         )
 
-        try:
-            session = KerioSession(config)
-            session.login()
-            user_info = session.whoami()
-            session.logout()
-            self.status_label.setText(f"Connected as {user_info.get('userName', 'user')}")
-            self.status_label.setStyleSheet("color: green;")
-        except Exception as e:
-            self.status_label.setText(f"Failed: {str(e)}")
-            self.status_label.setStyleSheet("color: red;")
+        # An account that is already connected with these settings can be
+        # checked with a single whoami on its live session
+        pooled = self.kerio_pool.find_session(config) if self.kerio_pool else None
+
+        def do_test():
+            try:
+                if pooled:
+                    user_info = pooled.whoami()
+                else:
+                    session = KerioSession(config)
+                    session.login()
+                    user_info = session.whoami()
+                    session.logout()
+                self._test_finished.emit(True, f"Connected as {user_info.get('userName', 'user')}")
+            except Exception as e:
+                self._test_finished.emit(False, f"Failed: {str(e)}")
+
+        # Login round-trips can take seconds; keep the dialog responsive
+        self.test_btn.setEnabled(False)
+        threading.Thread(target=do_test, daemon=True).start()
+
+    def _on_test_finished(self, success: bool, message: str):
+        """Show the connection test result (runs on the UI thread)."""
+        self.test_btn.setEnabled(True)
+        self.status_label.setText(message)
+        self.status_label.setStyleSheet("color: green;" if success else "color: red;")
 
     def _save_account(self):
         """Save the account."""
+        fields = self._read_form()
         if not self._validate():
             return
 
-        name = self.name_edit.text().strip()
-        email = self.email_edit.text().strip()
-        server = self.server_edit.text().strip()
-        username = self.username_edit.text().strip()
-        password = self.password_edit.text()
+        name = fields['name']
         is_default = self.default_check.isChecked()
 
         # Check for duplicate
-        existing = self.db.get_account_by_name(name)
+        existing = self._accounts_by_name.get(name)
         if existing and existing['id'] != self._current_account_id:
             QMessageBox.warning(self, "Error", f"An account named '{name}' already exists")
             return
 
         try:
-            self.db.save_account(
-                name=name,
-                email=email,
-                server=server,
-                username=username,
-                password=password,
-                is_default=is_default,
-                account_id=self._current_account_id
-            )
+            # Save and re-list in one transaction
+            with self.db.transaction():
+                self.db.save_account(
+                    **fields,
+                    is_default=is_default,
+                    account_id=self._current_account_id
+                )
+                accounts = self.db.get_accounts()
         except Exception as e:
             self.status_label.setText(f"Error: {e}")
             self.status_label.setStyleSheet("color: red;")
             return
 
-        self._load_accounts()
+        self._load_accounts(accounts)
         self.status_label.setText("Account saved")
         self.status_label.setStyleSheet("color: green;")
 
         # Notify app to refresh
-        if self.app and hasattr(self.app, '_load_accounts'):
-            self.app._load_accounts()
+        if self._reload_app_accounts:
+            self._reload_app_accounts()
 
 
 class SettingsDialog(QDialog):
@@ -285,6 +410,9 @@ class SettingsDialog(QDialog):
         super().__init__(parent)
         self.db = db
         self.app = app
+        # Optional app hooks, resolved once
+        self._apply_font = getattr(app, '_apply_font_size', None)
+        self._apply_theme = getattr(app, '_apply_theme_setting', None)
 
         self.setWindowTitle("Settings")
         self.setMinimumSize(450, 250)
@@ -309,11 +437,11 @@ class SettingsDialog(QDialog):
             except Exception:
                 pass
             # Fallback for Windows
-            return os.path.join(os.path.expanduser("~"), "Downloads")
+            return os.path.join(HOME, "Downloads")
 
         elif system == "Darwin":
             # macOS
-            return os.path.join(os.path.expanduser("~"), "Downloads")
+            return os.path.join(HOME, "Downloads")
 
         else:
             # Linux/Unix - check XDG user dirs
@@ -330,10 +458,11 @@ class SettingsDialog(QDialog):
             except Exception:
                 pass
             # Fallback for Linux
-            return os.path.join(os.path.expanduser("~"), "Downloads")
+            return os.path.join(HOME, "Downloads")
 
     def _create_ui(self):
         layout = QVBoxLayout(self)
+        settings = self.db.get_settings(["theme", "default_save_directory"])
 
         # Font size
         font_layout = QHBoxLayout()
@@ -350,7 +479,7 @@ class SettingsDialog(QDialog):
         theme_layout.addWidget(QLabel("Theme:"))
         self.theme_combo = QComboBox()
         self.theme_combo.addItems(["System", "Light", "Dark"])
-        current_theme = self.db.get_setting("theme", "System")
+        current_theme = settings.get("theme") or "System"
         index = self.theme_combo.findText(current_theme)
         if index >= 0:
             self.theme_combo.setCurrentIndex(index)
@@ -361,7 +490,7 @@ class SettingsDialog(QDialog):
         # Default save directory
         save_layout = QHBoxLayout()
         save_layout.addWidget(QLabel("Downloads Directory:"))
-        current_dir = self.db.get_setting("default_save_directory", "")
+        current_dir = settings.get("default_save_directory", "")
         if not current_dir:
             current_dir = self._get_default_downloads_dir()
         self.save_dir_edit = QLineEdit(current_dir)
@@ -397,7 +526,7 @@ class SettingsDialog(QDialog):
         """Browse for save directory."""
         initial = self.save_dir_edit.text()
         if not os.path.isdir(initial):
-            initial = os.path.expanduser("~")
+            initial = HOME
         new_dir = QFileDialog.getExistingDirectory(self, "Select Default Save Directory", initial)
         if new_dir:
             self.save_dir_edit.setText(new_dir)
@@ -405,21 +534,21 @@ class SettingsDialog(QDialog):
     def _save(self):
         """Save settings."""
         font_size = self.font_spin.value()
-        self.db.set_setting("font_size", str(font_size))
-        if hasattr(self.app, 'font_size'):
-            self.app.font_size = font_size
-            if hasattr(self.app, '_apply_font_size'):
-                self.app._apply_font_size()
-
-        # Save theme
         theme = self.theme_combo.currentText()
-        self.db.set_setting("theme", theme)
-        if hasattr(self.app, '_apply_theme_setting'):
-            self.app._apply_theme_setting(theme)
-
+        settings = {"font_size": str(font_size), "theme": theme}
         save_dir = self.save_dir_edit.text().strip()
         if save_dir and os.path.isdir(save_dir):
-            self.db.set_setting("default_save_directory", save_dir)
+            settings["default_save_directory"] = save_dir
+        self.db.set_settings(settings)
+
+        if hasattr(self.app, 'font_size'):
+            self.app.font_size = font_size
+            if self._apply_font:
+                self._apply_font()
+
+        # Apply theme
+        if self._apply_theme:
+            self._apply_theme(theme)
 
         self.accept()
 
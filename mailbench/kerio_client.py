@@ -3,13 +3,93 @@
 from __future__ import annotations
 
 import json
+import os
+import random
 import threading
-from concurrent.futures import ThreadPoolExecutor
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
+from itertools import chain
 from typing import Any, Callable, Dict, List, Optional
 from urllib.parse import urljoin
 import re
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# One connection pool for every KerioSession, so accounts on the same server
+# reuse each other's keep-alive TLS connections. Sessions stay separate for
+# their own cookies and tokens. Retry only covers failed connects and, for
+# GETs, gateway errors; POSTs are never replayed.
+_HTTP_ADAPTER = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504),
+                      raise_on_status=False),
+)
+
+
+def _json_dumps(value) -> bytes:
+    """Serialize a request body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value).encode()
+
+
+def _json_loads(data: bytes):
+    """Parse a response body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Fixed headers for every JSON-RPC POST (X-Token lives on the session)
+_RPC_HEADERS = {
+    "Accept": "application/json-rpc",
+    "Content-Type": "application/json-rpc; charset=UTF-8",
+}
+
+# JSON-RPC error codes a server answers a batch array with when it doesn't
+# take batches at all (parse error, invalid request); none of the calls ran
+_BATCH_REJECTED_CODES = (-32700, -32600)
+
+# Folder classification for _get_folder_type: Kerio's 'type' field first,
+# then an exact folder name, then the first name substring that matches
+_FOLDER_TYPE_BY_KERIO_TYPE = {
+    "inbox": "inbox",
+    "sent": "sent",
+    "fsent": "sent",
+    "drafts": "drafts",
+    "trash": "trash",
+    "junk": "junk",
+    "fjunk": "junk",
+    "outbox": "outbox",
+}
+_FOLDER_TYPE_BY_NAME = {"inbox": "inbox", "quarantine": "quarantine"}
+_FOLDER_NAME_TOKENS = (
+    ("sent", "sent"),
+    ("draft", "drafts"),
+    ("deleted", "trash"),
+    ("trash", "trash"),
+    ("junk", "junk"),
+    ("spam", "junk"),
+    ("outbox", "outbox"),
+)
+
+# Rows per Contacts.get request when reading a whole address book folder
+CONTACTS_PAGE_SIZE = 500
+
+# Shared read-only stand-in for missing nested objects in API rows
+_EMPTY_DICT: Dict = {}
+
+# mailSignature entry in webmail's generatedDefaults.js (a JSON string literal)
+_MAIL_SIGNATURE_RE = re.compile(rb'mailSignature:\s*("(?:[^"\\]|\\.)*")')
 
 
 def parse_email_address(addr: str) -> tuple[str, str]:
@@ -31,6 +111,44 @@ def parse_email_address(addr: str) -> tuple[str, str]:
     return ("", addr)
 
 
+def _format_recipient(recipient: Dict) -> str:
+    """Format a Kerio recipient object as "Name <email>" (or whichever part exists)."""
+    name = recipient.get('name', '')
+    addr = recipient.get('address', '')
+    if name and addr:
+        return f"{name} <{addr}>"
+    return addr or name
+
+
+def _iter_unique_contacts(rows: List[Dict], seen_emails: set):
+    """Yield a {name, email, type} entry per contact address not in seen_emails.
+
+    Adds each yielded address (lowercased) to seen_emails; the display name
+    is only built for contacts that contribute at least one address.
+    """
+    for contact in rows:
+        name = None
+        # Get all email addresses
+        for email_obj in contact.get("emailAddresses", []):
+            email = email_obj.get("address", "") if isinstance(email_obj, dict) else str(email_obj)
+            email_lower = email.lower()
+            if not email_lower or email_lower in seen_emails:
+                continue
+            seen_emails.add(email_lower)
+            if name is None:
+                # Build name from available fields
+                name = contact.get("commonName", "")
+                if not name:
+                    first = contact.get("firstName", "")
+                    last = contact.get("surName", "")
+                    name = f"{first} {last}".strip()
+            yield {
+                "name": name,
+                "email": email,
+                "type": "contact"
+            }
+
+
 def clean_error_message(msg: str) -> str:
     """Clean up Kerio error messages with unfilled placeholders.
 
@@ -50,7 +168,7 @@ def clean_error_message(msg: str) -> str:
     return cleaned.strip()
 
 
-@dataclass
+@dataclass(slots=True)
 class KerioConfig:
     """Configuration for a Kerio Connect connection."""
     email: str
@@ -63,55 +181,195 @@ class KerioConfig:
 class KerioSession:
     """Manages a single Kerio Connect JSON-RPC session."""
 
+    # How long a Folders.get listing is reused before asking the server again
+    FOLDERS_TTL = 30.0
+    # How long call_grouped waits for other calls to share its batch, when
+    # other grouped calls are already in progress on the session
+    GROUP_WINDOW = 0.01
+
     def __init__(self, config: KerioConfig):
         self.config = config
-        self.base_url = f"https://{config.server}/webmail/api/jsonrpc/"
+        self.host_url = f"https://{config.server}"
+        self.base_url = f"{self.host_url}/webmail/api/jsonrpc/"
         self.token: Optional[str] = None
         self.session = requests.Session()
         self.session.verify = True  # SSL verification
+        self.session.mount("https://", _HTTP_ADAPTER)
         self._request_id = 0
         self._lock = threading.Lock()
+        self._folders_cache: Optional[tuple[float, List[Dict]]] = None
+        self._inflight: Dict[tuple, Future] = {}  # read-only calls in progress
+        self._group: List[tuple[str, Optional[Dict], Future]] = []  # waiting for call_grouped
+        self._grouped_active = 0  # call_grouped callers not yet answered
+        self._batch_supported = True  # cleared if the server rejects batch arrays
 
     def _next_id(self) -> int:
         with self._lock:
             self._request_id += 1
             return self._request_id
 
-    def call(self, method: str, params: Optional[Dict] = None) -> Dict:
-        """Make a JSON-RPC call."""
-        request_id = self._next_id()
-
+    def _payload(self, method: str, params: Optional[Dict] = None) -> Dict:
+        """Build one JSON-RPC request object."""
         payload = {
             "jsonrpc": "2.0",
-            "id": request_id,
+            "id": self._next_id(),
             "method": method,
         }
         if params:
             payload["params"] = params
         if self.token:
             payload["token"] = self.token
+        return payload
 
-        headers = {
-            "Accept": "application/json-rpc",
-            "Content-Type": "application/json-rpc; charset=UTF-8",
-        }
-        if self.token:
-            headers["X-Token"] = self.token
-
+    def _post(self, payload: Any) -> Any:
+        """POST a JSON-RPC request (or batch) and return the decoded reply."""
         response = self.session.post(
             self.base_url,
-            json=payload,
-            headers=headers,
+            data=_json_dumps(payload),
+            headers=_RPC_HEADERS,
             timeout=30
         )
         response.raise_for_status()
+        return _json_loads(response.content)
 
-        result = response.json()
-        if "error" in result:
-            error = result["error"]
+    @staticmethod
+    def _unwrap(reply: Dict) -> Dict:
+        """Return a reply's result, raising KerioError for an error reply."""
+        if "error" in reply:
+            error = reply["error"]
             raise KerioError(clean_error_message(error.get("message", "Unknown error")), error.get("code", -1))
+        return reply.get("result", {})
 
-        return result.get("result", {})
+    def call(self, method: str, params: Optional[Dict] = None) -> Dict:
+        """Make a JSON-RPC call."""
+        return self._unwrap(self._post(self._payload(method, params)))
+
+    def call_coalesced(self, method: str, params: Optional[Dict] = None) -> Dict:
+        """Make a read-only JSON-RPC call, sharing the reply with an identical call in flight.
+
+        Only for calls without side effects (whoAmI, Folders.get, Mails.get, ...).
+        """
+        key = (method, json.dumps(params, sort_keys=True) if params else "")
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            result = self.call(method, params)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def call_batch(self, calls: List[tuple[str, Optional[Dict]]]) -> List[Any]:
+        """Make several JSON-RPC calls in one HTTP request.
+
+        Returns one entry per call, in order: the call's result, or the
+        KerioError it failed with. Falls back to one request per call only if
+        the server rejects the batch as a whole; any other failure is raised,
+        since the server may already have run some of the calls.
+        """
+        payloads = [self._payload(method, params) for method, params in calls]
+        replies = None
+        if len(payloads) > 1 and self._batch_supported:
+            replies = self._post(payloads)
+            if not isinstance(replies, list):
+                error = replies.get("error") if isinstance(replies, dict) else None
+                if error and error.get("code") in _BATCH_REJECTED_CODES:
+                    # Don't pay for a rejected batch on every later call
+                    self._batch_supported = False
+                    replies = None
+                elif error:
+                    self._unwrap(replies)  # raises the server's KerioError
+                else:
+                    raise KerioError("Unexpected reply to batched call", -1)
+        if replies is None:
+            replies = [self._post(payload) for payload in payloads]
+
+        # Replies may come back in any order; match them up by id
+        by_id = {reply.get("id"): reply for reply in replies if isinstance(reply, dict)}
+        results = []
+        for payload in payloads:
+            reply = by_id.get(payload["id"])
+            if reply is None:
+                results.append(KerioError("No response for batched call", -1))
+                continue
+            try:
+                results.append(self._unwrap(reply))
+            except KerioError as e:
+                results.append(e)
+        return results
+
+    def call_grouped(self, method: str, params: Optional[Dict] = None) -> Dict:
+        """Make a JSON-RPC call, batched with any others made within GROUP_WINDOW.
+
+        Groups are per session, so calls for different accounts never share
+        a batch. The first caller of a group sends it with call_batch; it only
+        waits out the window when other grouped calls are already running on
+        this session, so a lone call goes straight out. The rest block until
+        their reply arrives.
+
+        Only for read-only calls: if a batch fails as a whole, batching is
+        turned off for the session and each call is sent again on its own.
+        """
+        if not self._batch_supported:
+            return self.call(method, params)
+        future = Future()
+        with self._lock:
+            self._group.append((method, params, future))
+            first = len(self._group) == 1
+            busy = self._grouped_active > 0
+            self._grouped_active += 1
+        try:
+            if first:
+                if busy:
+                    time.sleep(self.GROUP_WINDOW)
+                self._flush_group()
+            return future.result()
+        finally:
+            with self._lock:
+                self._grouped_active -= 1
+
+    def _flush_group(self):
+        """Send every call queued by call_grouped as one batch."""
+        with self._lock:
+            group, self._group = self._group, []
+        try:
+            results = self.call_batch([(method, params) for method, params, _ in group])
+        except Exception as e:
+            if len(group) == 1:
+                group[0][2].set_exception(e)
+                return
+            # The calls are read-only, so replaying them one by one is safe
+            self._batch_supported = False
+            results = []
+            for method, params, _ in group:
+                try:
+                    results.append(self.call(method, params))
+                except Exception as call_error:
+                    results.append(call_error)
+        for (_, _, future), result in zip(group, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def download(self, url: str, timeout: int = 60) -> bytes:
+        """Download a file from the server using this session's connection pool."""
+        # Pass the token explicitly so downloads never depend on session header state
+        headers = {"X-Token": self.token} if self.token else None
+        response = self.session.get(url, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        return response.content
 
     def login(self) -> bool:
         """Authenticate with the Kerio server."""
@@ -126,7 +384,7 @@ class KerioSession:
         }
 
         result = self.call("Session.login", params)
-        self.token = result.get("token")
+        self._set_token(result.get("token"))
         if self.token:
             # Fetch user's display name
             try:
@@ -144,34 +402,57 @@ class KerioSession:
                 self.call("Session.logout")
             except Exception:
                 pass
-            self.token = None
+            self._set_token(None)
+
+    def _set_token(self, token: Optional[str]):
+        """Set the session token and the X-Token header sent with every request."""
+        self.token = token
+        if token:
+            self.session.headers["X-Token"] = token
+        else:
+            self.session.headers.pop("X-Token", None)
 
     def whoami(self) -> Dict:
         """Get current user info."""
-        return self.call("Session.whoAmI")
+        return self.call_coalesced("Session.whoAmI")
+
+    def get_folders(self, refresh: bool = False) -> List[Dict]:
+        """Get the Folders.get listing, reusing a recent one unless refresh is set."""
+        cached = self._folders_cache
+        if not refresh and cached and time.monotonic() - cached[0] < self.FOLDERS_TTL:
+            return cached[1]
+        folders = self.call_coalesced("Folders.get").get("list", [])
+        self._folders_cache = (time.monotonic(), folders)
+        return folders
+
+    def invalidate_folders(self):
+        """Forget the cached folder listing."""
+        self._folders_cache = None
 
     def get_signature(self) -> str:
         """Get user's email signature from webmail settings."""
-        import re
         try:
             # Signature is in the dynamically generated defaults JS file
-            url = f"https://{self.config.server}/webmail/generatedDefaults.js"
-            headers = {"X-Token": self.token} if self.token else {}
-            resp = self.session.get(url, headers=headers, timeout=10)
-
-            if resp.status_code != 200:
-                return ""
-
-            # Extract mailSignature field
-            match = re.search(r'mailSignature:\s*("(?:[^"\\]|\\.)*")', resp.text)
-            if match:
-                # Use json.loads to decode the escaped string
-                return json.loads(match.group(1))
+            url = f"{self.host_url}/webmail/generatedDefaults.js"
+            with self.session.get(url, timeout=10, stream=True) as resp:
+                if resp.status_code != 200:
+                    return ""
+
+                # Stop reading as soon as the field has arrived; a match
+                # always includes the closing quote, so it is never cut short
+                data = b""
+                for chunk in resp.iter_content(65536):
+                    data += chunk
+                    match = _MAIL_SIGNATURE_RE.search(data)
+                    if match:
+                        # Use json.loads to decode the escaped string
+                        return json.loads(match.group(1).decode("utf-8"))
             return ""
         except Exception:
             return ""
 
-    def upload_attachment(self, filename: str, content: bytes, content_type: str = None) -> tuple[Optional[str], Optional[str]]:
+    def upload_attachment(self, filename: str, content: bytes = None, content_type: str = None,
+                          path: str = None) -> tuple[Optional[str], Optional[str]]:
         """Upload an attachment file and return the attachment ID.
 
         Kerio requires attachments to be uploaded first, then referenced by ID
@@ -181,6 +462,7 @@ class KerioSession:
             filename: Name of the file
             content: File content as bytes
             content_type: MIME type (defaults to application/octet-stream)
+            path: File to stream the content from instead of passing content
 
         Returns:
             Tuple of (attachment_id, error_message). On success, error is None.
@@ -188,30 +470,32 @@ class KerioSession:
         if not content_type:
             content_type = "application/octet-stream"
 
-        upload_url = f"https://{self.config.server}/webmail/api/jsonrpc/attachment-upload/"
+        upload_url = f"{self.base_url}attachment-upload/"
 
         headers = {}
-        if self.token:
-            headers["X-Token"] = self.token
 
         # Build multipart body manually with proper headers
         import uuid
         boundary = f"----WebKitFormBoundary{uuid.uuid4().hex[:16]}"
 
-        body = []
-        body.append(f'--{boundary}'.encode())
-        body.append(f'Content-Disposition: form-data; name="file"; filename="{filename}"'.encode())
-        body.append(f'Content-Description: {filename}'.encode())
-        body.append(f'Content-Type: {content_type}'.encode())
-        body.append(b'')
-        body.append(content)
-        body.append(f'--{boundary}--'.encode())
+        head = b'\r\n'.join([
+            f'--{boundary}'.encode(),
+            f'Content-Disposition: form-data; name="file"; filename="{filename}"'.encode(),
+            f'Content-Description: {filename}'.encode(),
+            f'Content-Type: {content_type}'.encode(),
+            b'',
+            b'',
+        ])
+        tail = f'\r\n--{boundary}--'.encode()
 
-        multipart_body = b'\r\n'.join(body)
         headers["Content-Type"] = f"multipart/form-data; boundary={boundary}"
         headers["Content-Description"] = filename
 
         try:
+            if path is not None:
+                multipart_body = _MultipartFileBody(head, path, tail)
+            else:
+                multipart_body = head + (content or b'') + tail
             response = self.session.post(
                 upload_url,
                 data=multipart_body,
@@ -249,6 +533,29 @@ class KerioSession:
 
 
 
+class _MultipartFileBody:
+    """Multipart upload body read from a file as it is sent.
+
+    Has a length, so requests sends a Content-Length instead of chunking.
+    """
+
+    def __init__(self, head: bytes, path: str, tail: bytes):
+        self._head = head
+        self._path = path
+        self._tail = tail
+        self._length = len(head) + os.path.getsize(path) + len(tail)
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        yield self._head
+        with open(self._path, "rb") as f:
+            while chunk := f.read(65536):
+                yield chunk
+        yield self._tail
+
+
 class KerioError(Exception):
     """Kerio API error."""
     def __init__(self, message: str, code: int = -1):
@@ -279,6 +586,17 @@ class KerioConnectionPool:
         """Get existing session."""
         return self._sessions.get(account_id)
 
+    def find_session(self, config: KerioConfig) -> Optional[KerioSession]:
+        """Get a logged-in session using the same server and credentials, if any."""
+        with self._lock:
+            for session in self._sessions.values():
+                existing = session.config
+                if (session.token and existing.server == config.server
+                        and existing.username == config.username
+                        and existing.password == config.password):
+                    return session
+        return None
+
     def disconnect(self, account_id: int):
         """Disconnect and remove session."""
         with self._lock:
@@ -310,15 +628,41 @@ class KerioConnectionPool:
 class SyncManager:
     """Manages sync operations with background execution."""
 
-    def __init__(self, pool: KerioConnectionPool, db, root=None):
+    SIGNATURE_TTL = 300.0  # seconds a fetched signature is reused
+
+    def __init__(self, pool: KerioConnectionPool, db, root=None,
+                 max_workers: Optional[int] = None):
         self.pool = pool
         self.db = db
         self.root = root
-        self.executor = ThreadPoolExecutor(max_workers=4)
+        # Work here is mostly waiting on HTTP, so size well past the core count
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 4) * 4)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix="mailbench-sync")
         self._sync_in_progress: Dict[int, bool] = {}
         self._shutdown = False
         self._change_listeners: Dict[int, bool] = {}  # account_id -> listening
         self._sync_keys: Dict[int, Dict] = {}  # account_id -> syncKey
+        # (account_id, folder_id, limit) -> (syncKey when fetched, messages_data)
+        self._messages_cache: Dict[tuple, tuple] = {}
+        # (account_id, item_id) -> (session token, fetch_message_body result),
+        # least recent first; attachment URLs are only good for that session
+        self._body_cache: OrderedDict[tuple, tuple] = OrderedDict()
+        self._body_cache_max = 256
+        self._lock = threading.Lock()
+        # account_id -> {folder_type: folder_id}, rebuilt by each sync_folders
+        self._folder_type_index: Dict[int, Dict[str, str]] = {}
+        # Background address-book/notes fetches: at most 2 per account and 4
+        # overall, so a refresh of every account doesn't flood the server.
+        # They get their own workers, and an account's extra fetches wait in
+        # a queue rather than on a worker, so syncs never queue behind them.
+        self._fetch_executor = ThreadPoolExecutor(max_workers=4,
+                                                  thread_name_prefix="mailbench-fetch")
+        self._account_fetches_running: Dict[int, int] = {}
+        self._account_fetch_queue: Dict[int, deque] = {}
+        # account_id -> (monotonic time fetched, signature)
+        self._signature_cache: Dict[int, tuple] = {}
 
     def _ui_callback(self, callback: Callable, *args, **kwargs):
         """Execute callback on UI thread if root is available."""
@@ -329,6 +673,42 @@ class SyncManager:
         elif callback:
             callback(*args, **kwargs)
 
+    def _submit_fetch(self, account_id: int, fn: Callable):
+        """Queue a background fetch; it starts once the account has a free slot."""
+        with self._lock:
+            running = self._account_fetches_running.get(account_id, 0)
+            if running >= 2:
+                self._account_fetch_queue.setdefault(account_id, deque()).append(fn)
+                return
+            self._account_fetches_running[account_id] = running + 1
+        self._fetch_executor.submit(self._run_fetch, account_id, fn)
+
+    def _run_fetch(self, account_id: int, fn: Callable):
+        """Run a background fetch, then hand its slot to the account's next queued one."""
+        try:
+            fn()
+        finally:
+            with self._lock:
+                waiting = self._account_fetch_queue.get(account_id)
+                next_fn = waiting.popleft() if waiting and not self._shutdown else None
+                if next_fn is None:
+                    self._account_fetches_running[account_id] -= 1
+            if next_fn is not None:
+                self._fetch_executor.submit(self._run_fetch, account_id, next_fn)
+
+    def _forget_messages(self, account_id: int):
+        """Drop cached folder listings after a local change to an account's mail."""
+        with self._lock:
+            for key in list(self._messages_cache):
+                if key[0] == account_id:
+                    del self._messages_cache[key]
+
+    def _forget_bodies(self, account_id: int, item_ids):
+        """Drop cached message bodies for items that were removed or changed."""
+        with self._lock:
+            for item_id in item_ids:
+                self._body_cache.pop((account_id, item_id), None)
+
     def sync_folders(self, account_id: int, callback: Optional[Callable] = None):
         """Sync folder list for an account in background."""
         def do_sync():
@@ -338,25 +718,29 @@ class SyncManager:
                     self._ui_callback(callback, False, "Account not connected")
                     return
 
-                # Get folders
-                result = session.call("Folders.get")
-                folders = result.get("list", [])
+                # Get folders (always fresh; this is the explicit refresh)
+                folders = session.get_folders(refresh=True)
+
+                rows = [
+                    {
+                        "folder_id": folder.get("id", ""),
+                        "name": folder.get("name", ""),
+                        "parent_id": folder.get("parentId"),
+                        "folder_type": self._get_folder_type(folder),
+                        "unread_count": folder.get("unreadCount", 0),
+                        "total_count": folder.get("messageCount", 0),
+                    }
+                    for folder in folders
+                ]
 
-                # Clear existing folders
-                self.db.clear_folders(account_id)
+                # Write only folders that were added or changed, drop removed ones
+                self.db.update_folders(account_id, rows)
 
-                # Save folders to DB
-                for folder in folders:
-                    folder_type = self._get_folder_type(folder)
-                    self.db.save_folder(
-                        account_id=account_id,
-                        folder_id=folder.get("id", ""),
-                        name=folder.get("name", ""),
-                        parent_id=folder.get("parentId"),
-                        folder_type=folder_type,
-                        unread_count=folder.get("unreadCount", 0),
-                        total_count=folder.get("messageCount", 0)
-                    )
+                # First folder of each type wins, e.g. the trash used by deletes
+                type_index = {}
+                for row in rows:
+                    type_index.setdefault(row["folder_type"], row["folder_id"])
+                self._folder_type_index[account_id] = type_index
 
                 self.db.update_last_sync(account_id)
                 self._ui_callback(callback, True, None)
@@ -369,114 +753,133 @@ class SyncManager:
     def _get_folder_type(self, folder: Dict) -> str:
         """Determine folder type from Kerio folder data."""
         # Kerio provides a 'type' or we can infer from name
-        folder_type = folder.get("type", "").lower()
-        name_lower = folder.get("name", "").lower()
+        folder_type = _FOLDER_TYPE_BY_KERIO_TYPE.get(folder.get("type", "").lower())
+        if folder_type:
+            return folder_type
 
-        if folder_type == "inbox" or name_lower == "inbox":
-            return "inbox"
-        elif folder_type == "sent" or "sent" in name_lower:
-            return "sent"
-        elif folder_type == "drafts" or "draft" in name_lower:
-            return "drafts"
-        elif folder_type == "trash" or "deleted" in name_lower or "trash" in name_lower:
-            return "trash"
-        elif folder_type == "junk" or "junk" in name_lower or "spam" in name_lower:
-            return "junk"
-        elif folder_type == "outbox" or "outbox" in name_lower:
-            return "outbox"
-        elif name_lower == "quarantine":
-            return "quarantine"
+        name_lower = folder.get("name", "").lower()
+        folder_type = _FOLDER_TYPE_BY_NAME.get(name_lower)
+        if folder_type:
+            return folder_type
+        for token, folder_type in _FOLDER_NAME_TOKENS:
+            if token in name_lower:
+                return folder_type
         return "custom"
 
     def sync_messages(self, account_id: int, folder_id: str, limit: int = -1,
                       callback: Optional[Callable] = None):
         """Sync messages from a folder in background."""
-        if self._sync_in_progress.get(account_id):
-            return
-
-        self._sync_in_progress[account_id] = True
-
-        def do_sync():
-            try:
-                session = self.pool.get_session(account_id)
-                if not session:
-                    self._sync_in_progress[account_id] = False
-                    self._ui_callback(callback, False, "Account not connected", None)
-                    return
-
-                # Query messages - only fetch fields needed for list display (47x faster!)
-                query = {
-                    "fields": ["id", "subject", "from", "to", "receiveDate", "isSeen", "hasAttachment", "isFlagged", "isAnswered", "isForwarded"],
-                    "start": 0,
-                    "limit": limit,
-                    "orderBy": [{"columnName": "receiveDate", "direction": "Desc", "caseSensitive": False}]
-                }
-                result = session.call("Mails.get", {
-                    "folderIds": [folder_id],
-                    "query": query
-                })
-
-                messages = result.get("list", [])
-                total_items = result.get("totalItems", 0)
-
-                # Build UI data directly from API response (skip slow DB caching)
-                messages_data = []
-                for msg in messages:
-                    item_id = msg.get("id", "")
-                    if not item_id:
-                        continue
-
-                    # Parse sender
-                    sender = msg.get("from", {})
-                    sender_name = sender.get("name", "")
-                    sender_email = sender.get("address", "")
-
-                    # Parse recipients for sent/drafts folder display
-                    to_list = msg.get("to", [])
-                    if to_list:
-                        # Get first recipient for display
-                        first_to = to_list[0] if isinstance(to_list, list) else {}
-                        to_name = first_to.get("name", "") if isinstance(first_to, dict) else ""
-                        to_email = first_to.get("address", "") if isinstance(first_to, dict) else str(first_to)
-                        to_count = len(to_list) if isinstance(to_list, list) else 1
+        # Check-and-set under the lock so a listener-triggered sync and a
+        # user refresh can't both start a Mails.get for the same account
+        with self._lock:
+            if self._sync_in_progress.get(account_id):
+                return
+            self._sync_in_progress[account_id] = True
+
+        def fetch():
+            session = self.pool.get_session(account_id)
+            if not session:
+                return False, "Account not connected", None
+
+            # While the change listener runs, an unchanged syncKey means the
+            # mailbox hasn't changed since this listing was fetched
+            cache_key = (account_id, folder_id, limit)
+            sync_key = self._sync_keys.get(account_id) if self._change_listeners.get(account_id) else None
+            with self._lock:
+                cached = self._messages_cache.get(cache_key)
+            if sync_key is not None and cached and cached[0] == sync_key:
+                return True, None, cached[1]
+
+            # Query messages - only fetch fields needed for list display (47x faster!)
+            query = {
+                "fields": ["id", "subject", "from", "to", "receiveDate", "isSeen", "hasAttachment", "isFlagged", "isAnswered", "isForwarded"],
+                "start": 0,
+                "limit": limit,
+                "orderBy": [{"columnName": "receiveDate", "direction": "Desc", "caseSensitive": False}]
+            }
+            result = session.call_coalesced("Mails.get", {
+                "folderIds": [folder_id],
+                "query": query
+            })
+
+            messages = result.get("list", [])
+            total_items = result.get("totalItems", 0)
+
+            # Build UI data directly from API response (skip slow DB caching)
+            messages_data = []
+            append = messages_data.append
+            for msg in messages:
+                get = msg.get
+                item_id = get("id", "")
+                if not item_id:
+                    continue
+
+                # Parse sender
+                sender_get = (get("from") or _EMPTY_DICT).get
+
+                # Parse recipients for sent/drafts folder display
+                to_list = get("to")
+                if to_list:
+                    # Get first recipient for display
+                    if isinstance(to_list, list):
+                        first_to = to_list[0]
+                        to_count = len(to_list)
+                    else:
+                        first_to = _EMPTY_DICT
+                        to_count = 1
+                    if isinstance(first_to, dict):
+                        to_name = first_to.get("name", "")
+                        to_email = first_to.get("address", "")
                     else:
                         to_name = ""
-                        to_email = ""
-                        to_count = 0
+                        to_email = str(first_to)
+                else:
+                    to_name = ""
+                    to_email = ""
+                    to_count = 0
 
+                append({
+                    "item_id": item_id,
+                    "subject": get("subject", ""),
+                    "sender_name": sender_get("name", ""),
+                    "sender_email": sender_get("address", ""),
+                    "to_name": to_name,
+                    "to_email": to_email,
+                    "to_count": to_count,
+                    "date_received": get("receiveDate", ""),
+                    "is_read": get("isSeen", False),
                     # Check for attachments - Kerio may use different field names
-                    has_attachments = (msg.get("hasAttachment", False) or
-                                      msg.get("hasAttachments", False) or
-                                      bool(msg.get("attachments", [])))
-
-                    messages_data.append({
-                        "item_id": item_id,
-                        "subject": msg.get("subject", ""),
-                        "sender_name": sender_name,
-                        "sender_email": sender_email,
-                        "to_name": to_name,
-                        "to_email": to_email,
-                        "to_count": to_count,
-                        "date_received": msg.get("receiveDate", ""),
-                        "is_read": msg.get("isSeen", False),
-                        "has_attachments": has_attachments,
-                        "is_flagged": msg.get("isFlagged", False),
-                        "is_answered": msg.get("isAnswered", False),
-                        "is_forwarded": msg.get("isForwarded", False)
-                    })
+                    "has_attachments": (get("hasAttachment", False) or
+                                        get("hasAttachments", False) or
+                                        bool(get("attachments"))),
+                    "is_flagged": get("isFlagged", False),
+                    "is_answered": get("isAnswered", False),
+                    "is_forwarded": get("isForwarded", False)
+                })
+
+            if sync_key is not None:
+                with self._lock:
+                    self._messages_cache[cache_key] = (sync_key, messages_data)
 
-                self._sync_in_progress[account_id] = False
-                self._ui_callback(callback, True, None, messages_data)
+            return True, None, messages_data
 
+        def do_sync():
+            try:
+                result = fetch()
             except Exception as e:
-                self._sync_in_progress[account_id] = False
-                self._ui_callback(callback, False, str(e), None)
+                result = (False, str(e), None)
+            finally:
+                with self._lock:
+                    self._sync_in_progress[account_id] = False
+            self._ui_callback(callback, *result)
 
         self.executor.submit(do_sync)
 
     def fetch_message_body(self, account_id: int, item_id: str,
                            callback: Optional[Callable] = None):
         """Fetch full message body on demand."""
+        cache_key = (account_id, item_id)
+
         def do_fetch():
             try:
                 session = self.pool.get_session(account_id)
@@ -484,6 +887,21 @@ class SyncManager:
                     self._ui_callback(callback, False, "Account not connected", None)
                     return
 
+                # Re-opening a message while triaging is common; mail content
+                # doesn't change, so serve recent bodies fetched by this same
+                # login from memory (a reconnect gets a new token)
+                with self._lock:
+                    cached = self._body_cache.get(cache_key)
+                    if cached is not None and session.token and cached[0] == session.token:
+                        self._body_cache.move_to_end(cache_key)
+                        cached = cached[1]
+                    elif cached is not None:
+                        del self._body_cache[cache_key]
+                        cached = None
+                if cached is not None:
+                    self._ui_callback(callback, True, cached, None)
+                    return
+
                 # Fetch full message by ID
                 result = session.call("Mails.getById", {"ids": [item_id]})
                 # Kerio returns {result: [messages]} for getById
@@ -519,31 +937,28 @@ class SyncManager:
                 # Handle inline attachments (images with contentId)
                 # Replace cid: references with actual URLs
                 attachments = msg.get("attachments", [])
-                session = self.pool.get_session(account_id)
-                if session and attachments and body:
-                    base_url = f"https://{session.config.server}"
-                    for att in attachments:
-                        content_id = att.get("contentId", "")
-                        att_url = att.get("url", "")
-                        if content_id and att_url:
-                            # Replace cid:contentId with full URL
-                            full_url = base_url + att_url
-                            body = body.replace(f'cid:{content_id}', full_url)
+                if attachments and body:
+                    base_url = session.host_url
+                    cid_urls = {
+                        att["contentId"]: base_url + att["url"]
+                        for att in attachments
+                        if att.get("contentId") and att.get("url")
+                    }
+                    if cid_urls:
+                        # Replace every cid:contentId with its full URL in one pass;
+                        # longest ids first so one id can't shadow a longer one
+                        cid_re = re.compile("cid:(" + "|".join(
+                            map(re.escape, sorted(cid_urls, key=len, reverse=True))
+                        ) + ")")
+                        body = cid_re.sub(lambda m: cid_urls[m.group(1)], body)
 
                 # Get recipients (to, cc)
                 to_list = msg.get("to", [])
                 cc_list = msg.get("cc", [])
 
                 # Format recipients as "Name <email>" strings for reply support
-                def format_recipient(r):
-                    name = r.get('name', '')
-                    addr = r.get('address', '')
-                    if name and addr:
-                        return f"{name} <{addr}>"
-                    return addr or name
-
-                to_str = ", ".join(format_recipient(r) for r in to_list)
-                cc_str = ", ".join(format_recipient(r) for r in cc_list)
+                to_str = ", ".join([_format_recipient(r) for r in to_list]) if to_list else ""
+                cc_str = ", ".join([_format_recipient(r) for r in cc_list]) if cc_list else ""
 
                 # Get non-inline attachments for display
                 display_attachments = []
@@ -569,6 +984,12 @@ class SyncManager:
                     "attachments": display_attachments
                 }
 
+                with self._lock:
+                    self._body_cache[cache_key] = (session.token, msg_data)
+                    self._body_cache.move_to_end(cache_key)
+                    if len(self._body_cache) > self._body_cache_max:
+                        self._body_cache.popitem(last=False)
+
                 self._ui_callback(callback, True, msg_data, None)
 
             except Exception as e:
@@ -637,6 +1058,16 @@ class SyncManager:
         It does NOT send a read receipt (MDN) to the sender, even if the
         original message requested one. This protects user privacy.
         """
+        self.mark_messages_read(account_id, [item_id], is_read, callback)
+
+    def mark_messages_read(self, account_id: int, item_ids: List[str], is_read: bool = True,
+                           callback: Optional[Callable] = None):
+        """Mark several messages as read/unread with a single Mails.set call.
+
+        Like mark_as_read, this never sends read receipts.
+        """
+        item_ids = list(item_ids)
+
         def do_mark():
             try:
                 session = self.pool.get_session(account_id)
@@ -645,17 +1076,13 @@ class SyncManager:
                     return
 
                 # Update message seen status (Kerio uses isSeen, not flags.seen)
-                result = session.call("Mails.set", {
-                    "mails": [{
-                        "id": item_id,
-                        "isSeen": is_read
-                    }]
+                session.call("Mails.set", {
+                    "mails": [{"id": item_id, "isSeen": is_read} for item_id in item_ids]
                 })
 
                 # Update cache
-                cached = self.db.get_message_by_item_id(item_id)
-                if cached:
-                    self.db.update_message_read(cached["id"], is_read)
+                self.db.update_messages_read(item_ids, is_read)
+                self._forget_messages(account_id)
 
                 self._ui_callback(callback, True, None)
 
@@ -667,6 +1094,13 @@ class SyncManager:
     def set_flag(self, account_id: int, item_id: str, is_flagged: bool = True,
                  callback: Optional[Callable] = None):
         """Set or clear the flag on a message."""
+        self.set_flags(account_id, [item_id], is_flagged, callback)
+
+    def set_flags(self, account_id: int, item_ids: List[str], is_flagged: bool = True,
+                  callback: Optional[Callable] = None):
+        """Set or clear the flag on several messages with a single Mails.set call."""
+        item_ids = list(item_ids)
+
         def do_set_flag():
             try:
                 session = self.pool.get_session(account_id)
@@ -675,13 +1109,13 @@ class SyncManager:
                     return
 
                 # Update message flag status
-                result = session.call("Mails.set", {
-                    "mails": [{
-                        "id": item_id,
-                        "isFlagged": is_flagged
-                    }]
+                session.call("Mails.set", {
+                    "mails": [{"id": item_id, "isFlagged": is_flagged} for item_id in item_ids]
                 })
 
+                self.db.update_messages_flagged(item_ids, is_flagged)
+                self._forget_messages(account_id)
+
                 self._ui_callback(callback, True, None)
 
             except Exception as e:
@@ -692,43 +1126,56 @@ class SyncManager:
     def delete_message(self, account_id: int, item_id: str, hard_delete: bool = False,
                        callback: Optional[Callable] = None):
         """Delete a message. If hard_delete=True, permanently delete; otherwise move to trash."""
+        self.delete_messages(
+            account_id, [item_id], hard_delete,
+            callback=(lambda s, e, ids: callback(s, e)) if callback else None
+        )
+
+    def delete_messages(self, account_id: int, item_ids: List[str], hard_delete: bool = False,
+                        callback: Optional[Callable] = None):
+        """Delete several messages with a single RPC call.
+
+        Callback receives (success, error, item_ids).
+        """
+        item_ids = list(item_ids)
+
         def do_delete():
             try:
                 session = self.pool.get_session(account_id)
                 if not session:
-                    self._ui_callback(callback, False, "Account not connected")
+                    self._ui_callback(callback, False, "Account not connected", item_ids)
                     return
 
                 if hard_delete:
                     # Permanently delete
-                    session.call("Mails.remove", {"ids": [item_id]})
+                    session.call("Mails.remove", {"ids": item_ids})
                 else:
                     # Move to trash - find trash folder first
-                    folders = self.db.get_folders(account_id)
-                    trash_folder = None
-                    for f in folders:
-                        if f.get("folder_type") == "trash":
-                            trash_folder = f
-                            break
+                    trash_folder_id = self._folder_type_index.get(account_id, {}).get("trash")
+                    if not trash_folder_id:
+                        for f in self.db.get_folders(account_id):
+                            if f.get("folder_type") == "trash":
+                                trash_folder_id = f["folder_id"]
+                                break
 
-                    if trash_folder:
+                    if trash_folder_id:
                         session.call("Mails.move", {
-                            "ids": [item_id],
-                            "folder": trash_folder["folder_id"]
+                            "ids": item_ids,
+                            "folder": trash_folder_id
                         })
                     else:
                         # No trash folder found, just remove
-                        session.call("Mails.remove", {"ids": [item_id]})
+                        session.call("Mails.remove", {"ids": item_ids})
 
                 # Remove from cache
-                cached = self.db.get_message_by_item_id(item_id)
-                if cached:
-                    self.db.delete_message(cached["id"])
+                self.db.delete_messages_by_item_id(item_ids)
+                self._forget_messages(account_id)
+                self._forget_bodies(account_id, item_ids)
 
-                self._ui_callback(callback, True, None)
+                self._ui_callback(callback, True, None, item_ids)
 
             except Exception as e:
-                self._ui_callback(callback, False, str(e))
+                self._ui_callback(callback, False, str(e), item_ids)
 
         self.executor.submit(do_delete)
 
@@ -747,6 +1194,7 @@ class SyncManager:
                     "ids": [item_id],
                     "folder": target_folder_id
                 })
+                self._forget_messages(account_id)
 
                 self._ui_callback(callback, True, None)
 
@@ -788,6 +1236,7 @@ class SyncManager:
 
                 # Clear local cache for this folder
                 self.db.clear_messages(account_id, folder_id)
+                self._forget_messages(account_id)
 
                 self._ui_callback(callback, True, None, len(ids))
 
@@ -848,13 +1297,17 @@ class SyncManager:
                 if attachments:
                     attachment_parts = []
                     for att in attachments:
-                        content = att.get('content', b'')
-                        if isinstance(content, str):
-                            content = content.encode('utf-8')
                         name = att.get('name', 'attachment')
+                        content = att.get('content')
+                        path = None
+                        if content is None and att.get('path'):
+                            # Files attached in compose are streamed from disk
+                            path = att['path']
+                        elif isinstance(content, str):
+                            content = content.encode('utf-8')
 
                         # Upload attachment first to get an ID
-                        att_id, upload_error = session.upload_attachment(name, content)
+                        att_id, upload_error = session.upload_attachment(name, content, path=path)
                         if att_id:
                             attachment_parts.append({
                                 "id": att_id,
@@ -871,7 +1324,9 @@ class SyncManager:
                     if attachment_parts:
                         mail["attachments"] = attachment_parts
 
+                # Sent on its own: Mails.create is not safe to batch or replay
                 result = session.call("Mails.create", {"mails": [mail]})
+                self._forget_messages(account_id)
                 # Check for errors in result
                 errors = result.get("errors", [])
                 if errors:
@@ -879,7 +1334,7 @@ class SyncManager:
                     self._ui_callback(callback, False, "; ".join(error_msgs))
                     return
 
-                # Mark original message as answered/forwarded
+                # Mark original message as answered/forwarded, only once the send succeeded
                 if original_id and (is_reply or is_forward):
                     try:
                         update_data = {"id": original_id}
@@ -919,6 +1374,7 @@ class SyncManager:
                 sync_key = result.get("syncKey")
                 self._sync_keys[account_id] = sync_key
 
+                backoff = 1.0
                 while self._change_listeners.get(account_id) and not self._shutdown:
                     try:
                         # Long-poll for changes (30 second timeout for efficiency)
@@ -931,21 +1387,39 @@ class SyncManager:
                         sync_key = result.get("syncKey")
                         self._sync_keys[account_id] = sync_key
 
+                        if any(change.get("type") == "mtFolder" for change in changes):
+                            session.invalidate_folders()
+                        changed_ids = [change["itemId"] for change in changes if change.get("itemId")]
+                        if changed_ids:
+                            self._forget_bodies(account_id, changed_ids)
+
                         if changes and callback:
                             self._ui_callback(callback, account_id, changes)
+                        backoff = 1.0
 
-                    except Exception as e:
-                        if not self._shutdown:
-                            # Brief pause before retry on error
-                            import time
-                            time.sleep(1)
+                    except requests.exceptions.ReadTimeout:
+                        # The server held the poll for its full timeout; just poll again
+                        continue
+                    except Exception:
+                        # Back off (with jitter, capped at 30s) so an outage doesn't
+                        # turn every listener into a 1 Hz reconnect loop; sleep in
+                        # short slices so shutdown isn't held up
+                        delay = min(30.0, backoff) * (0.75 + 0.5 * random.random())
+                        deadline = time.monotonic() + delay
+                        while (time.monotonic() < deadline and not self._shutdown
+                               and self._change_listeners.get(account_id)):
+                            time.sleep(0.2)
+                        backoff = min(30.0, backoff * 2)
 
             except Exception:
                 pass
             finally:
                 self._change_listeners[account_id] = False
 
-        self.executor.submit(do_listen)
+        # The long-poll blocks for up to 30s at a time; give it its own thread
+        # rather than parking one of the executor's sync workers on it
+        threading.Thread(target=do_listen, name=f"mailbench-changes-{account_id}",
+                         daemon=True).start()
 
     def stop_change_listener(self, account_id: int):
         """Stop listening for changes."""
@@ -965,53 +1439,56 @@ class SyncManager:
 
                 # First, get all contact folders
                 try:
-                    folders_result = session.call("Folders.get")
                     contact_folder_ids = []
-                    for f in folders_result.get("list", []):
+                    for f in session.get_folders():
                         if f.get("type", "").lower() == "fcontact":
                             contact_folder_ids.append(f.get("id"))
                 except Exception:
                     contact_folder_ids = []
 
-                # Fetch contacts from each contact folder
-                for folder_id in contact_folder_ids:
-                    try:
+                def get_folder_contacts(folder_id):
+                    # Page through the folder so contacts past the first page
+                    # aren't dropped; most folders still fit in one request
+                    rows = []
+                    start = 0
+                    while True:
                         # Use minimal query - don't specify fields
-                        result = session.call("Contacts.get", {
+                        result = session.call_grouped("Contacts.get", {
                             "folderIds": [folder_id],
                             "query": {
-                                "start": 0,
-                                "limit": 500
+                                "start": start,
+                                "limit": CONTACTS_PAGE_SIZE
                             }
                         })
-
-                        for contact in result.get("list", []):
-                            # Build name from available fields
-                            name = contact.get("commonName", "")
-                            if not name:
-                                first = contact.get("firstName", "")
-                                last = contact.get("surName", "")
-                                name = f"{first} {last}".strip()
-
-                            # Get all email addresses
-                            for email_obj in contact.get("emailAddresses", []):
-                                email = email_obj.get("address", "") if isinstance(email_obj, dict) else str(email_obj)
-                                if email and email.lower() not in seen_emails:
-                                    seen_emails.add(email.lower())
-                                    contacts.append({
-                                        "name": name,
-                                        "email": email,
-                                        "type": "contact"
-                                    })
-                    except Exception:
-                        pass
+                        page = result.get("list", [])
+                        rows.extend(page)
+                        start += len(page)
+                        if len(page) < CONTACTS_PAGE_SIZE or start >= result.get("totalItems", start + 1):
+                            return rows
+
+                # Fetch all contact folders at once. A local pool rather than
+                # _fetch_executor, since this already runs on one of its workers.
+                # Results are merged in folder order so duplicates resolve the
+                # same way every time.
+                folder_results = []
+                if contact_folder_ids:
+                    with ThreadPoolExecutor(max_workers=min(8, len(contact_folder_ids))) as pool:
+                        futures = [pool.submit(get_folder_contacts, fid) for fid in contact_folder_ids]
+                    for future in futures:
+                        try:
+                            folder_results.append(future.result())
+                        except Exception:
+                            pass
+
+                for folder_contacts in folder_results:
+                    contacts.extend(_iter_unique_contacts(folder_contacts, seen_emails))
 
                 self._ui_callback(callback, True, None, contacts)
 
             except Exception as e:
                 self._ui_callback(callback, False, str(e), [])
 
-        self.executor.submit(do_fetch)
+        self._submit_fetch(account_id, do_fetch)
 
     def fetch_users(self, account_id: int, callback: Optional[Callable] = None):
         """Fetch internal mail users by extracting from sent messages."""
@@ -1031,9 +1508,8 @@ class SyncManager:
 
                 # Find the Sent folder
                 try:
-                    folders_result = session.call("Folders.get")
                     sent_folder_id = None
-                    for f in folders_result.get("list", []):
+                    for f in session.get_folders():
                         ftype = f.get("type", "").lower()
                         fname = f.get("name", "").lower()
                         if ftype == "fsent" or "sent" in fname:
@@ -1045,7 +1521,7 @@ class SyncManager:
                 # Extract recipients from sent messages
                 if sent_folder_id and domain:
                     try:
-                        result = session.call("Mails.get", {
+                        result = session.call_grouped("Mails.get", {
                             "folderIds": [sent_folder_id],
                             "query": {
                                 "fields": ["id", "to", "cc"],
@@ -1055,20 +1531,22 @@ class SyncManager:
                             }
                         })
 
+                        seen_add = seen_emails.add
+                        users_append = users.append
+                        domain_suffix = "@" + domain.lower()
                         for msg in result.get("list", []):
-                            for recipient_list in [msg.get("to", []), msg.get("cc", [])]:
-                                for r in recipient_list:
-                                    email = r.get("address", "")
-                                    name = r.get("name", "")
-                                    # Only include users from the same domain (internal users)
-                                    if email and email.lower().endswith("@" + domain.lower()):
-                                        if email.lower() not in seen_emails:
-                                            seen_emails.add(email.lower())
-                                            users.append({
-                                                "name": name,
-                                                "email": email,
-                                                "type": "user"
-                                            })
+                            for r in chain(msg.get("to") or (), msg.get("cc") or ()):
+                                email = r.get("address", "")
+                                email_lower = email.lower()
+                                # Only include users from the same domain (internal users)
+                                if (email_lower and email_lower.endswith(domain_suffix)
+                                        and email_lower not in seen_emails):
+                                    seen_add(email_lower)
+                                    users_append({
+                                        "name": r.get("name", ""),
+                                        "email": email,
+                                        "type": "user"
+                                    })
                     except Exception:
                         pass
 
@@ -1077,24 +1555,31 @@ class SyncManager:
             except Exception as e:
                 self._ui_callback(callback, False, str(e), [])
 
-        self.executor.submit(do_fetch)
+        self._submit_fetch(account_id, do_fetch)
 
-    def fetch_signature(self, account_id: int, callback: Optional[Callable] = None):
-        """Fetch user's email signature."""
+    def fetch_signature(self, account_id: int, callback: Optional[Callable] = None,
+                        refresh: bool = False):
+        """Fetch user's email signature, reusing one fetched in the last SIGNATURE_TTL seconds."""
         def do_fetch():
             try:
+                entry = self._signature_cache.get(account_id)
+                if entry and not refresh and time.monotonic() - entry[0] < self.SIGNATURE_TTL:
+                    self._ui_callback(callback, True, None, entry[1])
+                    return
+
                 session = self.pool.get_session(account_id)
                 if not session:
                     self._ui_callback(callback, False, "Not connected", "")
                     return
 
                 signature = session.get_signature()
+                self._signature_cache[account_id] = (time.monotonic(), signature)
                 self._ui_callback(callback, True, None, signature)
 
             except Exception as e:
                 self._ui_callback(callback, False, str(e), "")
 
-        self.executor.submit(do_fetch)
+        self._submit_fetch(account_id, do_fetch)
 
     def shutdown(self):
         """Shutdown the executor."""
@@ -1103,6 +1588,7 @@ class SyncManager:
         for account_id in list(self._change_listeners.keys()):
             self._change_listeners[account_id] = False
         self.executor.shutdown(wait=False, cancel_futures=True)
+        self._fetch_executor.shutdown(wait=False, cancel_futures=True)
 
     # ==================== Folder Management ====================
 
@@ -1124,6 +1610,7 @@ class SyncManager:
                     folder_data["parentId"] = parent_id
 
                 result = session.call("Folders.create", {"folders": [folder_data]})
+                session.invalidate_folders()
 
                 # Get created folder ID
                 created = result.get("result", [])
@@ -1148,8 +1635,7 @@ class SyncManager:
                     self._ui_callback(callback, False, "Account not connected", None)
                     return
 
-                result = session.call("Folders.get")
-                folders = result.get("list", [])
+                folders = session.get_folders()
 
                 # Look for junk/spam folder
                 for folder in folders:
@@ -1177,8 +1663,7 @@ class SyncManager:
                     self._ui_callback(callback, False, "Account not connected", None)
                     return
 
-                result = session.call("Folders.get")
-                folders = result.get("list", [])
+                folders = session.get_folders()
 
                 # Look for notes folder (type "fnotes" or name "Notes")
                 for folder in folders:
@@ -1233,7 +1718,7 @@ class SyncManager:
             except Exception as e:
                 self._ui_callback(callback, False, str(e), [])
 
-        self.executor.submit(do_fetch)
+        self._submit_fetch(account_id, do_fetch)
 
     def create_note(self, account_id: int, folder_id: str, subject: str, text: str,
                     callback: Optional[Callable] = None):
@@ -1369,8 +1854,7 @@ class SyncManager:
                     self._ui_callback(callback, False, "Account not connected", [])
                     return
 
-                result = session.call("Folders.get")
-                folders = result.get("list", [])
+                folders = session.get_folders()
 
                 contact_folders = []
                 for folder in folders:
@@ -1472,7 +1956,7 @@ class SyncManager:
             except Exception as e:
                 self._ui_callback(callback, False, str(e), [])
 
-        self.executor.submit(do_fetch)
+        self._submit_fetch(account_id, do_fetch)
 
     def create_contact(self, account_id: int, folder_id: str, contact_data: dict,
                        callback: Optional[Callable] = None):
@@ -1662,7 +2146,7 @@ class SyncManager:
             except Exception as e:
                 self._ui_callback(callback, False, str(e), [])
 
-        self.executor.submit(do_fetch)
+        self._submit_fetch(account_id, do_fetch)
 
     def fetch_server_users(self, account_id: int,
                            callback: Optional[Callable] = None):
@@ -1753,4 +2237,4 @@ class SyncManager:
             except Exception as e:
                 self._ui_callback(callback, False, str(e), [])
 
-        self.executor.submit(do_fetch)
+        self._submit_fetch(account_id, do_fetch)
@@ -1,21 +1,41 @@
 """Desktop launcher creation for Mailbench."""
 
+import functools
 import os
 import platform
 import shutil
+import subprocess
 import sys
 from pathlib import Path
 
+# Fixed for the life of the process, so resolve them once
+_PLATFORM = platform.system()
+_SYSTEM = _PLATFORM.lower()
+_HOME = Path.home()
+_PACKAGE_DIR = Path(__file__).parent
+
+
+@functools.lru_cache(maxsize=4)
+def _which(name):
+    """shutil.which, remembered so repeated launcher builds don't rescan PATH."""
+    return shutil.which(name)
+
+
+def _which_mailbench():
+    """Find the installed mailbench command, preferring the .exe on Windows."""
+    if _SYSTEM == "windows":
+        return _which("mailbench.exe") or _which("mailbench")
+    return _which("mailbench")
+
 
 def get_executable_path():
     """Get the path to the mailbench executable."""
-    return shutil.which("mailbench") or sys.executable
+    return _which_mailbench() or sys.executable
 
 
 def get_icon_path():
     """Get the path to the bundled icon."""
-    package_dir = Path(__file__).parent
-    return package_dir / "resources" / "mailbench.png"
+    return _PACKAGE_DIR / "resources" / "mailbench.png"
 
 
 def install_icon_linux():
@@ -25,14 +45,20 @@ def install_icon_linux():
         print(f"Warning: Icon not found at {icon_source}")
         return None
 
-    icon_dir = Path.home() / ".local" / "share" / "icons" / "hicolor" / "256x256" / "apps"
+    icon_dir = _HOME / ".local" / "share" / "icons" / "hicolor" / "256x256" / "apps"
     icon_dir.mkdir(parents=True, exist_ok=True)
 
     icon_dest = icon_dir / "mailbench.png"
-    shutil.copy2(icon_source, icon_dest)
+    shutil.copyfile(icon_source, icon_dest)
 
+    # Fire and forget: the cache rebuild can take seconds on large themes
     try:
-        os.system("gtk-update-icon-cache -f -t ~/.local/share/icons/hicolor 2>/dev/null")
+        subprocess.Popen(
+            ["gtk-update-icon-cache", "-f", "-t", str(_HOME / ".local" / "share" / "icons" / "hicolor")],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
     except Exception:
         pass
 
@@ -46,7 +72,7 @@ def create_linux_launcher():
 
     desktop_file = os.path.join(desktop_dir, "mailbench.desktop")
 
-    exec_path = shutil.which("mailbench")
+    exec_path = _which_mailbench()
     if not exec_path:
         exec_path = f"{sys.executable} -m mailbench"
 
@@ -66,8 +92,7 @@ Terminal=false
 StartupWMClass=mailbench
 """
 
-    with open(desktop_file, "w") as f:
-        f.write(content)
+    Path(desktop_file).write_text(content)
 
     os.chmod(desktop_file, 0o755)
 
@@ -85,7 +110,7 @@ def create_macos_launcher():
     os.makedirs(app_dir, exist_ok=True)
     os.makedirs(resources_dir, exist_ok=True)
 
-    exec_path = shutil.which("mailbench")
+    exec_path = _which_mailbench()
     if not exec_path:
         exec_path = f"{sys.executable} -m mailbench"
 
@@ -94,14 +119,13 @@ def create_macos_launcher():
 exec {exec_path}
 """
 
-    with open(launcher_script, "w") as f:
-        f.write(content)
+    Path(launcher_script).write_text(content)
     os.chmod(launcher_script, 0o755)
 
     icon_source = get_icon_path()
     icon_dest = os.path.join(resources_dir, "mailbench.png")
     if icon_source.exists():
-        shutil.copy2(icon_source, icon_dest)
+        shutil.copyfile(icon_source, icon_dest)
 
     plist_file = os.path.join(app_base, "Info.plist")
     plist_content = """<?xml version="1.0" encoding="UTF-8"?>
@@ -124,8 +148,7 @@ exec {exec_path}
 </plist>
 """
 
-    with open(plist_file, "w") as f:
-        f.write(plist_content)
+    Path(plist_file).write_text(plist_content)
 
     print(f"Created macOS application: ~/Applications/Mailbench.app")
     print("You can drag it to your Dock or find it in ~/Applications.")
@@ -135,15 +158,13 @@ exec {exec_path}
 def create_windows_launcher():
     """Create a Start Menu shortcut for Windows."""
     try:
-        from pathlib import Path
-
         start_menu = Path(os.environ.get("APPDATA", "")) / "Microsoft" / "Windows" / "Start Menu" / "Programs"
 
         if not start_menu.exists():
             print(f"Could not find Start Menu folder: {start_menu}")
             return False
 
-        exec_path = shutil.which("mailbench.exe") or shutil.which("mailbench")
+        exec_path = _which_mailbench()
         if not exec_path:
             exec_path = f'"{sys.executable}" -m mailbench'
 
@@ -152,8 +173,7 @@ def create_windows_launcher():
 start "" {exec_path}
 """
 
-        with open(bat_file, "w") as f:
-            f.write(content)
+        Path(bat_file).write_text(content)
 
         print(f"Created Windows Start Menu launcher: {bat_file}")
         print("You can find Mailbench in your Start Menu.")
@@ -164,7 +184,7 @@ start "" {exec_path}
 
         desktop = os.path.expanduser("~/Desktop")
         if os.path.exists(desktop):
-            exec_path = shutil.which("mailbench.exe") or shutil.which("mailbench")
+            exec_path = _which_mailbench()
             if not exec_path:
                 exec_path = f'"{sys.executable}" -m mailbench'
 
@@ -172,8 +192,7 @@ start "" {exec_path}
             content = f"""@echo off
 start "" {exec_path}
 """
-            with open(bat_file, "w") as f:
-                f.write(content)
+            Path(bat_file).write_text(content)
 
             print(f"Created Desktop launcher instead: {bat_file}")
             return True
@@ -183,9 +202,9 @@ start "" {exec_path}
 
 def create_launcher():
     """Create a desktop launcher appropriate for the current OS."""
-    system = platform.system().lower()
+    system = _SYSTEM
 
-    print(f"Detected OS: {platform.system()}")
+    print(f"Detected OS: {_PLATFORM}")
 
     if system == "linux":
         return create_linux_launcher()
@@ -200,7 +219,7 @@ def create_launcher():
 
 def remove_launcher():
     """Remove the desktop launcher for the current OS."""
-    system = platform.system().lower()
+    system = _SYSTEM
 
     if system == "linux":
         removed = False
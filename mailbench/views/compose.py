@@ -1,9 +1,14 @@
 """Qt Compose email widget for inline composition in preview pane."""
 
+import base64
+import bisect
+import functools
 import os
 import re
 import html as html_module
 from datetime import datetime
+from email.utils import getaddresses
+from html.parser import HTMLParser
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
@@ -11,7 +16,9 @@ from PySide6.QtWidgets import (
     QFileDialog, QMessageBox, QSizePolicy, QFrame, QCompleter,
     QMenu, QToolButton, QApplication
 )
-from PySide6.QtCore import Qt, Signal, QStringListModel, QUrl
+from PySide6.QtCore import (
+    Qt, Signal, QStringListModel, QUrl, QTimer, QBuffer, QByteArray, QEventLoop
+)
 from PySide6.QtGui import (
     QFont, QTextCharFormat, QAction, QKeySequence, QTextCursor,
     QTextBlockFormat
@@ -27,32 +34,193 @@ try:
 except ImportError:
     pass
 
+# Body content of a full document handed to WebEngineEditor.setHtml
+_BODY_CONTENT_RE = re.compile(r'<body[^>]*>(.*)</body>', re.IGNORECASE | re.DOTALL)
+
+# Rewrites applied by ComposeWidget._get_html_body to outgoing HTML
+_FONT_FAMILY_RE = re.compile(r"font-family:['\"]?[^;'\"]+['\"]?;")
+_P_TAG_RE = re.compile(r'<p\b([^>]*)>')
+
+
+def _p_with_margin(match):
+    """Replacement for _P_TAG_RE: prepend a paragraph margin to the tag's style."""
+    attrs = match.group(1)
+    i = attrs.rfind('style="')
+    if i >= 0:
+        i += len('style="')
+        return f'<p{attrs[:i]}margin: 0.3em 0; {attrs[i:]}>'
+    if 'style=' in attrs:
+        return match.group(0)
+    return f'<p style="margin: 0.3em 0;"{attrs}>'
+
+
+# Escapes for embedding HTML in a JavaScript template literal, applied in one pass
+_JS_TEMPLATE_ESCAPES = str.maketrans({'\\': '\\\\', '`': '\\`', '$': '\\$'})
+
+# Whitespace cleanup for _html_to_plain_text, compiled once
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+_SPACES_RE = re.compile(r'[ \t]+')
+
+
+class _PlainTextExtractor(HTMLParser):
+    """Flatten HTML to text in one pass, dropping style/script/head content."""
+
+    # Text written for block-level tags; everything else just disappears
+    START_TAG_TEXT = {'br': '\n', 'p': '\n', 'div': '\n', 'tr': '\n', 'li': '\n• '}
+    END_TAG_TEXT = {'p': '\n'}
+    SKIPPED_TAGS = frozenset(('style', 'script', 'head'))
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._parts = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        """Enter a skipped block or emit a block tag's text."""
+        if tag in self.SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif not self._skip_depth:
+            text = self.START_TAG_TEXT.get(tag)
+            if text:
+                self._parts.append(text)
+
+    def handle_endtag(self, tag):
+        """Leave a skipped block or emit a closing tag's text."""
+        if tag in self.SKIPPED_TAGS:
+            if self._skip_depth:
+                self._skip_depth -= 1
+        elif not self._skip_depth:
+            text = self.END_TAG_TEXT.get(tag)
+            if text:
+                self._parts.append(text)
+
+    def handle_data(self, data):
+        """Keep text that is outside any skipped block."""
+        if not self._skip_depth:
+            self._parts.append(data)
+
+    def result(self):
+        """Return the text collected so far, flushing any buffered input."""
+        self.close()
+        return ''.join(self._parts)
+
+
+@functools.lru_cache(maxsize=128)
+def _html_to_plain_text(html_body):
+    """Convert HTML to plain text, properly stripping style/script blocks.
+
+    Cached because reply/forward of the same message converts the same body.
+    """
+    if not html_body:
+        return ""
+
+    if '<' in html_body or '&' in html_body:
+        # Single parse: drops style/script/head, turns block tags into
+        # newlines, strips the rest and decodes entities
+        parser = _PlainTextExtractor()
+        parser.feed(html_body)
+        text = parser.result()
+    else:
+        # Already plain text - nothing for the parser to do
+        text = html_body
+
+    # Clean up whitespace
+    text = _BLANK_LINES_RE.sub('\n\n', text)
+    text = _SPACES_RE.sub(' ', text)
+    lines = [line.strip() for line in text.split('\n')]
+    text = '\n'.join(lines).strip()
+
+    return text
+
+
+# Document wrapper (doctype, html, head, body) removed from quoted HTML in one pass
+_DOCUMENT_WRAPPER_RE = re.compile(
+    r'<!DOCTYPE[^>]*>|<html[^>]*>|</html>|<head[^>]*>.*?</head>|<body[^>]*>|</body>',
+    re.IGNORECASE | re.DOTALL
+)
+_REMOTE_IMG_RE = re.compile(r'<img[^>]*src\s*=\s*["\']https?://[^"\']*["\'][^>]*>', re.IGNORECASE)
+_BLANK_IMG_RE = re.compile(r'<img[^>]*src\s*=\s*["\']about:blank["\'][^>]*>', re.IGNORECASE)
+
+
+def _html_body_content(body_html, strip_remote_images):
+    """Reduce an HTML message to its body content for quoting in a reply/forward."""
+    # Remove doctype, html, head, body tags but keep content
+    body_html = _DOCUMENT_WRAPPER_RE.sub('', body_html)
+    if strip_remote_images:
+        body_html = _REMOTE_IMG_RE.sub('', body_html)
+    # Always remove about:blank images (blocked images)
+    body_html = _BLANK_IMG_RE.sub('', body_html)
+    return body_html.strip()
+
+
+def _format_address(name, email):
+    """Format a parsed address as "Name <email>", quoting names with separators."""
+    if not name:
+        return email
+    if any(c in name for c in ',;<>@"'):
+        name = '"' + name.replace('\\', '\\\\').replace('"', '\\"') + '"'
+    return f"{name} <{email}>"
+
+
+@functools.lru_cache(maxsize=64)
+def _format_quote_date(date):
+    """Format a Kerio YYYYMMDDTHHMMSS date for a quote header; other values pass through.
+
+    Cached so replying to or forwarding the same message twice formats it once.
+    """
+    if date and len(date) >= 15:
+        try:
+            # Fixed-width fields, so slice them rather than run strptime
+            dt = datetime(int(date[0:4]), int(date[4:6]), int(date[6:8]),
+                          int(date[9:11]), int(date[11:13]), int(date[13:15]))
+            return dt.strftime("%B %d, %Y at %I:%M %p")
+        except ValueError:
+            pass
+    return date
+
+
+@functools.lru_cache(maxsize=16)
+def _signature_html(signature):
+    """Format a signature as HTML; cached since every compose for an account reuses it."""
+    if not signature:
+        return ""
+    # Signature may be HTML or plain text
+    sig = signature
+    if '<' not in sig:
+        # Plain text - escape and convert newlines
+        sig = html_module.escape(sig).replace('\n', '<br>')
+    # Return signature as-is - QTextEdit should handle <font> tags
+    return f'<p><br></p>{sig}'
+
 
 class RichTextEdit(QTextEdit):
     """QTextEdit with guaranteed clipboard support."""
 
     def keyPressEvent(self, event):
         """Handle key press events, ensuring clipboard operations work."""
-        # Check for Ctrl+V (paste)
-        if event.key() == Qt.Key.Key_V and event.modifiers() == Qt.KeyboardModifier.ControlModifier:
-            self._do_paste()
-            event.accept()
-            return
-        # Check for Ctrl+C (copy)
-        if event.key() == Qt.Key.Key_C and event.modifiers() == Qt.KeyboardModifier.ControlModifier:
-            self.copy()
-            event.accept()
-            return
-        # Check for Ctrl+X (cut)
-        if event.key() == Qt.Key.Key_X and event.modifiers() == Qt.KeyboardModifier.ControlModifier:
-            self.cut()
-            event.accept()
-            return
-        # Check for Ctrl+A (select all)
-        if event.key() == Qt.Key.Key_A and event.modifiers() == Qt.KeyboardModifier.ControlModifier:
-            self.selectAll()
-            event.accept()
-            return
+        # Plain typing has no Ctrl, so it skips the key checks entirely
+        if event.modifiers() == Qt.KeyboardModifier.ControlModifier:
+            key = event.key()
+            # Check for Ctrl+V (paste)
+            if key == Qt.Key.Key_V:
+                self._do_paste()
+                event.accept()
+                return
+            # Check for Ctrl+C (copy)
+            if key == Qt.Key.Key_C:
+                self.copy()
+                event.accept()
+                return
+            # Check for Ctrl+X (cut)
+            if key == Qt.Key.Key_X:
+                self.cut()
+                event.accept()
+                return
+            # Check for Ctrl+A (select all)
+            if key == Qt.Key.Key_A:
+                self.selectAll()
+                event.accept()
+                return
         super().keyPressEvent(event)
 
     def _do_paste(self):
@@ -65,13 +233,11 @@ class RichTextEdit(QTextEdit):
             image = clipboard.image()
             if not image.isNull():
                 # Convert image to base64 data URI
-                from PySide6.QtCore import QBuffer, QByteArray
                 buffer = QByteArray()
                 qbuffer = QBuffer(buffer)
                 qbuffer.open(QBuffer.OpenModeFlag.WriteOnly)
                 image.save(qbuffer, "PNG")
                 qbuffer.close()
-                import base64
                 b64_data = base64.b64encode(buffer.data()).decode('ascii')
                 img_html = f'<img src="data:image/png;base64,{b64_data}"/>'
                 self.insertHtml(img_html)
@@ -92,6 +258,7 @@ if HAS_WEBENGINE:
             self._font_size = font_size
             self._html_content = ""
             self._ready = False
+            self._page_requested = False
 
             # Create page and allow JavaScript
             page = QWebEnginePage(self)
@@ -103,14 +270,18 @@ if HAS_WEBENGINE:
             settings.setAttribute(QWebEngineSettings.WebAttribute.LocalContentCanAccessRemoteUrls, True)
             settings.setAttribute(QWebEngineSettings.WebAttribute.FocusOnNavigationEnabled, True)
 
-            # Load editable HTML template
-            self._load_editor()
+            # Load the empty editable template once construction is done, unless
+            # content arrives first - reply/forward set it straight away, and
+            # loading the blank page only to replace it costs a full page load
+            QTimer.singleShot(0, self._load_editor)
 
             # Connect load finished to set ready flag
             self.loadFinished.connect(self._on_load_finished)
 
         def _load_editor(self):
             """Load the editable HTML template."""
+            if self._page_requested:
+                return
             html = f'''<!DOCTYPE html>
 <html>
 <head>
@@ -126,6 +297,7 @@ body {{
 p {{ margin: 0; padding: 0; }}
 </style>
 <script>
+document.addEventListener('input', function() {{ window.mbDirty = true; }});
 document.addEventListener('keydown', function(e) {{
     if (e.key === 'Tab') {{
         e.preventDefault();
@@ -150,14 +322,14 @@ document.addEventListener('keydown', function(e) {{
         def _set_inner_html(self, html):
             """Set the innerHTML of the editor body."""
             # Escape the HTML for JavaScript string
-            escaped = html.replace('\\', '\\\\').replace('`', '\\`').replace('$', '\\$')
+            escaped = html.translate(_JS_TEMPLATE_ESCAPES)
             js = f'document.getElementById("editor").innerHTML = `{escaped}`;'
             self.page().runJavaScript(js)
 
         def setHtml(self, html):
             """Set HTML content (compatible with QTextEdit API)."""
             # Extract body content if full HTML document
-            body_match = re.search(r'<body[^>]*>(.*)</body>', html, re.IGNORECASE | re.DOTALL)
+            body_match = _BODY_CONTENT_RE.search(html)
             if body_match:
                 content = body_match.group(1)
             else:
@@ -169,6 +341,7 @@ document.addEventListener('keydown', function(e) {{
                 # Store for when ready
                 self._html_content = content
                 # Also call parent setHtml to load the template
+                self._page_requested = True
                 super().setHtml(self._get_template_with_content(content))
 
         def _get_template_with_content(self, content):
@@ -188,6 +361,7 @@ body {{
 p {{ margin: 0; padding: 0; }}
 </style>
 <script>
+document.addEventListener('input', function() {{ window.mbDirty = true; }});
 document.addEventListener('keydown', function(e) {{
     if (e.key === 'Tab') {{
         e.preventDefault();
@@ -240,7 +414,6 @@ p {{ margin: 0; padding: 0; }}
 
             This blocks until the JavaScript returns.
             """
-            from PySide6.QtCore import QEventLoop
             loop = QEventLoop()
             result = [None]
 
@@ -271,6 +444,23 @@ p {{ margin: 0; padding: 0; }}
             loop.exec()
             return result[0]
 
+        def isModifiedSync(self):
+            """Whether the user has edited the body since its content was loaded.
+
+            Reads a flag set by the page's input listener, so only a boolean
+            crosses over from JavaScript. Blocks until the JavaScript returns.
+            """
+            loop = QEventLoop()
+            result = [False]
+
+            def callback(dirty):
+                result[0] = bool(dirty)
+                loop.quit()
+
+            self.page().runJavaScript('window.mbDirty === true', callback)
+            loop.exec()
+            return result[0]
+
         def execCommand(self, command, value=None):
             """Execute a document.execCommand for formatting."""
             if value:
@@ -356,16 +546,68 @@ p {{ margin: 0; padding: 0; }}
             pass
 
 
+# Attachment card styles, shared by every card instead of rebuilt per card
+_ATTACH_CARD_QSS_DARK = """
+    QFrame#attachCard {
+        background-color: #3c3f41;
+        border: 1px solid #555;
+        border-radius: 4px;
+    }
+    QFrame#attachCard:hover {
+        background-color: #4c5052;
+        border: 1px solid #666;
+    }
+"""
+_ATTACH_CARD_QSS_LIGHT = """
+    QFrame#attachCard {
+        background-color: #f5f5f5;
+        border: 1px solid #ddd;
+        border-radius: 4px;
+    }
+    QFrame#attachCard:hover {
+        background-color: #e8e8e8;
+        border: 1px solid #ccc;
+    }
+"""
+_ATTACH_MENU_BTN_QSS = """
+    QToolButton {{
+        background: transparent;
+        border: none;
+        font-size: 10px;
+        color: {color};
+    }}
+    QToolButton:hover {{
+        background-color: {hover};
+        border-radius: 4px;
+    }}
+    QToolButton::menu-indicator {{
+        image: none;
+    }}
+"""
+_ATTACH_MENU_BTN_QSS_DARK = _ATTACH_MENU_BTN_QSS.format(color='#888', hover='#4c5052')
+_ATTACH_MENU_BTN_QSS_LIGHT = _ATTACH_MENU_BTN_QSS.format(color='#666', hover='#ddd')
+
+# Completion order for address book entries; anything else sorts last
+_ADDRESS_TYPE_PRIORITY = {'user': 0, 'contact': 1}
+
+
 class AddressLineEdit(QLineEdit):
     """Line edit with email address autocomplete supporting multiple addresses."""
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self._addresses = []  # Display strings: "Name <email>" or "email"
+        self._address_keys = []  # Lowercased search tokens per display string
+        self._prefix_index = []  # Sorted (token, address index) pairs
+        self._last_prefix = None  # Previous lookup, narrowed as the user types on
+        self._last_matches = []
         self._completer = QCompleter(self)
-        self._completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
-        self._completer.setFilterMode(Qt.MatchFlag.MatchContains)
+        # Matching is done by _match_indices; the popup shows whatever it found
+        self._completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
         self._completer.setWidget(self)
+        # One model for the widget's lifetime; lookups only swap its rows
+        self._model = QStringListModel(self._completer)
+        self._completer.setModel(self._model)
         self._completer.activated.connect(self._insert_completion)
         # Don't use setCompleter - we manage it manually for multi-address support
         self.textChanged.connect(self._on_text_changed)
@@ -373,31 +615,52 @@ class AddressLineEdit(QLineEdit):
     def set_address_book(self, addresses):
         """Set the address book for autocompletion."""
         # Sort: users (QLF) first, then contacts, then recent
-        sorted_addrs = []
-        for addr in addresses:
-            addr_type = addr.get('type', '')
-            if addr_type == 'user':
-                priority = 0
-            elif addr_type == 'contact':
-                priority = 1
-            else:
-                priority = 2
-            sorted_addrs.append((priority, addr))
-
-        sorted_addrs.sort(key=lambda x: (x[0], (x[1].get('name') or '').lower()))
+        sorted_addrs = sorted(
+            addresses,
+            key=lambda a: (_ADDRESS_TYPE_PRIORITY.get(a.get('type'), 2), (a.get('name') or '').lower())
+        )
 
         # Build display strings
-        self._addresses = []
-        for _, addr in sorted_addrs:
-            name = addr.get('name', '')
-            email = addr.get('email', '')
-            if name:
-                display = f"{name} <{email}>"
-            else:
-                display = email
-            self._addresses.append(display)
-
-        self._completer.setModel(QStringListModel(self._addresses, self._completer))
+        self._addresses = [
+            f"{addr['name']} <{addr.get('email', '')}>" if addr.get('name') else addr.get('email', '')
+            for addr in sorted_addrs
+        ]
+
+        # Index each entry under its display string, email, email domain and
+        # name words so a prefix lookup finds "smith" in "John Smith <...>"
+        self._address_keys = []
+        prefix_index = []
+        for i, (addr, display) in enumerate(zip(sorted_addrs, self._addresses)):
+            email = (addr.get('email') or '').lower()
+            tokens = {display.lower(), email, email.partition('@')[2]}
+            tokens.update((addr.get('name') or '').lower().split())
+            tokens.discard('')
+            self._address_keys.append(tuple(tokens))
+            prefix_index.extend((token, i) for token in tokens)
+        prefix_index.sort()
+        self._prefix_index = prefix_index
+        self._last_prefix = None
+        self._last_matches = []
+
+    def _match_indices(self, text):
+        """Indexes of addresses with a token starting with text, in display order."""
+        prefix = text.lower()
+        if self._last_prefix is not None and prefix.startswith(self._last_prefix):
+            # Typing on only narrows the previous result
+            address_keys = self._address_keys
+            matches = [i for i in self._last_matches
+                       if any(key.startswith(prefix) for key in address_keys[i])]
+        else:
+            index = self._prefix_index
+            found = set()
+            pos = bisect.bisect_left(index, (prefix,))
+            while pos < len(index) and index[pos][0].startswith(prefix):
+                found.add(index[pos][1])
+                pos += 1
+            matches = sorted(found)
+        self._last_prefix = prefix
+        self._last_matches = matches
+        return matches
 
     def _get_current_prefix(self):
         """Get the text before the current address being typed."""
@@ -421,10 +684,15 @@ class AddressLineEdit(QLineEdit):
         """Handle text changes to show completer for current address."""
         current_addr = self._get_current_address_text()
         if len(current_addr) >= 1:
-            self._completer.setCompletionPrefix(current_addr)
-            if self._completer.completionCount() > 0:
+            matches = self._match_indices(current_addr)
+            if matches:
+                addresses = self._addresses
+                self._model.setStringList([addresses[i] for i in matches])
                 self._completer.complete()
+            else:
+                self._completer.popup().hide()
         else:
+            self._last_prefix = None
             self._completer.popup().hide()
 
     def _insert_completion(self, text):
@@ -451,6 +719,9 @@ class ComposeWidget(QWidget):
     message_sent = Signal()
     compose_cancelled = Signal()
 
+    # (setter, value) -> QTextCharFormat, shared by all compose widgets
+    _char_formats = {}
+
     def __init__(self, parent, db, sync_manager, account_id=None,
                  reply_to=None, forward=None, attachments=None, signature=None,
                  font_size=12, zoom=100, default_attach_dir=None):
@@ -465,6 +736,7 @@ class ComposeWidget(QWidget):
         self._font_size = font_size
         self._zoom = zoom / 100.0  # Convert percentage to factor
         self._default_attach_dir = default_attach_dir or ""
+        self._format_state = None  # (bold, italic, underline) last shown on the buttons
 
         self._is_dark = False  # Always light mode
 
@@ -481,6 +753,9 @@ class ComposeWidget(QWidget):
             self._setup_new_message()
 
         # Store initial state for change detection
+        if not self._use_webengine:
+            # Setup above filled the document; only edits from here count
+            self.body_edit.document().setModified(False)
         self._initial_state = self._get_current_state()
 
     def _create_ui(self):
@@ -524,14 +799,17 @@ class ComposeWidget(QWidget):
         header.addWidget(QLabel("From:"), 0, 0)
         self.from_combo = QComboBox()
         self._accounts = self.db.get_accounts()
-        for acc in self._accounts:
-            self.from_combo.addItem(f"{acc['name']} <{acc['email']}>")
+        # One model update for all accounts instead of one per addItem
+        self.from_combo.addItems([f"{acc['name']} <{acc['email']}>" for acc in self._accounts])
 
         # Select default or specified account
-        for i, acc in enumerate(self._accounts):
-            if acc.get('is_default') or (self.account_id and acc['id'] == self.account_id):
-                self.from_combo.setCurrentIndex(i)
-                break
+        default_idx = next(
+            (i for i, acc in enumerate(self._accounts)
+             if acc.get('is_default') or (self.account_id and acc['id'] == self.account_id)),
+            None
+        )
+        if default_idx is not None:
+            self.from_combo.setCurrentIndex(default_idx)
         header.addWidget(self.from_combo, 0, 1)
 
         # To (with autocomplete)
@@ -618,7 +896,12 @@ class ComposeWidget(QWidget):
             body_font = QFont("Sans Serif")
             body_font.setPointSize(int(self._font_size * self._zoom))  # QTextEdit needs font scaling
             self.body_edit.setFont(body_font)
-            self.body_edit.cursorPositionChanged.connect(self._update_format_buttons)
+            # Cursor moves arrive per keystroke; refresh the B/I/U buttons once they settle
+            self._format_timer = QTimer(self)
+            self._format_timer.setSingleShot(True)
+            self._format_timer.setInterval(30)
+            self._format_timer.timeout.connect(self._update_format_buttons)
+            self.body_edit.cursorPositionChanged.connect(self._format_timer.start)
             self.body_edit.setTabStopDistance(40)
             self._set_default_paragraph_format()
             self._use_webengine = False
@@ -644,74 +927,45 @@ class ComposeWidget(QWidget):
         # Use WidgetWithChildrenShortcut context so child widgets still get their shortcuts
         context = Qt.ShortcutContext.WidgetWithChildrenShortcut
 
-        # Ctrl+B for bold
-        bold_shortcut = QAction(self)
-        bold_shortcut.setShortcut(QKeySequence("Ctrl+B"))
-        bold_shortcut.setShortcutContext(context)
-        bold_shortcut.triggered.connect(self._toggle_bold)
-        self.addAction(bold_shortcut)
-
-        # Ctrl+I for italic
-        italic_shortcut = QAction(self)
-        italic_shortcut.setShortcut(QKeySequence("Ctrl+I"))
-        italic_shortcut.setShortcutContext(context)
-        italic_shortcut.triggered.connect(self._toggle_italic)
-        self.addAction(italic_shortcut)
-
-        # Ctrl+U for underline
-        underline_shortcut = QAction(self)
-        underline_shortcut.setShortcut(QKeySequence("Ctrl+U"))
-        underline_shortcut.setShortcutContext(context)
-        underline_shortcut.triggered.connect(self._toggle_underline)
-        self.addAction(underline_shortcut)
-
-        # Ctrl+Enter to send
-        send_shortcut = QAction(self)
-        send_shortcut.setShortcut(QKeySequence("Ctrl+Return"))
-        send_shortcut.setShortcutContext(context)
-        send_shortcut.triggered.connect(self._send)
-        self.addAction(send_shortcut)
-
-        # Escape to discard
-        esc_shortcut = QAction(self)
-        esc_shortcut.setShortcut(QKeySequence("Escape"))
-        esc_shortcut.setShortcutContext(context)
-        esc_shortcut.triggered.connect(self._discard)
-        self.addAction(esc_shortcut)
-
+        for keys, slot in (
+            ("Ctrl+B", self._toggle_bold),
+            ("Ctrl+I", self._toggle_italic),
+            ("Ctrl+U", self._toggle_underline),
+            ("Ctrl+Return", self._send),  # Send
+            ("Escape", self._discard),  # Discard
+        ):
+            action = QAction(self)
+            action.setShortcut(QKeySequence(keys))
+            action.setShortcutContext(context)
+            action.triggered.connect(slot)
+            self.addAction(action)
 
     def _toggle_bold(self):
         """Toggle bold formatting."""
         if self._use_webengine:
             self.body_edit.toggleBold()
         else:
-            fmt = QTextCharFormat()
             if self.body_edit.fontWeight() == QFont.Weight.Bold:
-                fmt.setFontWeight(QFont.Weight.Normal)
+                self._merge_format(self._char_format('setFontWeight', QFont.Weight.Normal))
             else:
-                fmt.setFontWeight(QFont.Weight.Bold)
-            self._merge_format(fmt)
-            self._update_format_buttons()
+                self._merge_format(self._char_format('setFontWeight', QFont.Weight.Bold))
+            self._update_format_buttons(force=True)
 
     def _toggle_italic(self):
         """Toggle italic formatting."""
         if self._use_webengine:
             self.body_edit.toggleItalic()
         else:
-            fmt = QTextCharFormat()
-            fmt.setFontItalic(not self.body_edit.fontItalic())
-            self._merge_format(fmt)
-            self._update_format_buttons()
+            self._merge_format(self._char_format('setFontItalic', not self.body_edit.fontItalic()))
+            self._update_format_buttons(force=True)
 
     def _toggle_underline(self):
         """Toggle underline formatting."""
         if self._use_webengine:
             self.body_edit.toggleUnderline()
         else:
-            fmt = QTextCharFormat()
-            fmt.setFontUnderline(not self.body_edit.fontUnderline())
-            self._merge_format(fmt)
-            self._update_format_buttons()
+            self._merge_format(self._char_format('setFontUnderline', not self.body_edit.fontUnderline()))
+            self._update_format_buttons(force=True)
 
     def _change_font_size(self, size_str):
         """Change font size."""
@@ -720,12 +974,21 @@ class ComposeWidget(QWidget):
             if self._use_webengine:
                 self.body_edit.setFontSize(size)
             else:
-                fmt = QTextCharFormat()
-                fmt.setFontPointSize(size)
-                self._merge_format(fmt)
+                self._merge_format(self._char_format('setFontPointSize', size))
         except ValueError:
             pass
 
+    @classmethod
+    def _char_format(cls, setter: str, value) -> QTextCharFormat:
+        """Shared format with one property set, e.g. ('setFontItalic', True); built on first use."""
+        key = (setter, value)
+        fmt = cls._char_formats.get(key)
+        if fmt is None:
+            fmt = QTextCharFormat()
+            getattr(fmt, setter)(value)
+            cls._char_formats[key] = fmt
+        return fmt
+
     def _merge_format(self, fmt: QTextCharFormat):
         """Apply format to selection or current position."""
         cursor = self.body_edit.textCursor()
@@ -734,11 +997,24 @@ class ComposeWidget(QWidget):
         cursor.mergeCharFormat(fmt)
         self.body_edit.mergeCurrentCharFormat(fmt)
 
-    def _update_format_buttons(self):
-        """Update button states based on current format."""
-        self.bold_btn.setChecked(self.body_edit.fontWeight() == QFont.Weight.Bold)
-        self.italic_btn.setChecked(self.body_edit.fontItalic())
-        self.underline_btn.setChecked(self.body_edit.fontUnderline())
+    def _update_format_buttons(self, force=False):
+        """Update button states based on current format.
+
+        force re-applies every button, e.g. after a click has toggled one itself.
+        """
+        state = (self.body_edit.fontWeight() == QFont.Weight.Bold,
+                 self.body_edit.fontItalic(),
+                 self.body_edit.fontUnderline())
+        last = self._format_state
+        if force:
+            last = None
+        elif state == last:
+            return
+        # Only touch the buttons whose state flipped
+        for i, btn in enumerate((self.bold_btn, self.italic_btn, self.underline_btn)):
+            if last is None or state[i] != last[i]:
+                btn.setChecked(state[i])
+        self._format_state = state
 
     def _insert_bullet(self):
         """Insert bullet point."""
@@ -773,16 +1049,19 @@ class ComposeWidget(QWidget):
         files, _ = QFileDialog.getOpenFileNames(
             self, "Select files to attach", self._default_attach_dir
         )
+        count = len(self._attachments)
         for filepath in files:
+            # Only note the file here; its bytes are read when the message is sent
             try:
-                with open(filepath, 'rb') as f:
-                    content = f.read()
+                size = os.path.getsize(filepath)
                 name = os.path.basename(filepath)
-                self._attachments.append({'name': name, 'content': content, 'path': filepath})
+                self._attachments.append({'name': name, 'path': filepath, 'size': size})
             except Exception as e:
                 QMessageBox.warning(self, "Error", f"Failed to read {filepath}: {e}")
 
-        self._update_attachments_display()
+        # Cancelled picker or nothing readable - the cards are already current
+        if len(self._attachments) != count:
+            self._update_attachments_display()
 
     def _format_file_size(self, size_bytes: int) -> str:
         """Format file size in human-readable form."""
@@ -834,10 +1113,13 @@ class ComposeWidget(QWidget):
 
     def _update_attachments_display(self):
         """Update attachments display with cards."""
+        # Rebuild with painting off so the half-built list is never drawn
+        self._attachments_widget.setUpdatesEnabled(False)
         self._clear_attachments_layout()
 
         if not self._attachments:
             self._attachments_widget.hide()
+            self._attachments_widget.setUpdatesEnabled(True)
             return
 
         self._attachments_widget.show()
@@ -861,36 +1143,14 @@ class ComposeWidget(QWidget):
 
         cards_layout.addStretch()
         self._attachments_layout.addWidget(cards_widget)
+        self._attachments_widget.setUpdatesEnabled(True)
 
     def _create_attachment_card(self, index: int, attachment: dict) -> QWidget:
         """Create a card widget for an attachment."""
         card = QFrame()
         card.setFrameShape(QFrame.Shape.NoFrame)
 
-        if self._is_dark:
-            card.setStyleSheet("""
-                QFrame#attachCard {
-                    background-color: #3c3f41;
-                    border: 1px solid #555;
-                    border-radius: 4px;
-                }
-                QFrame#attachCard:hover {
-                    background-color: #4c5052;
-                    border: 1px solid #666;
-                }
-            """)
-        else:
-            card.setStyleSheet("""
-                QFrame#attachCard {
-                    background-color: #f5f5f5;
-                    border: 1px solid #ddd;
-                    border-radius: 4px;
-                }
-                QFrame#attachCard:hover {
-                    background-color: #e8e8e8;
-                    border: 1px solid #ccc;
-                }
-            """)
+        card.setStyleSheet(_ATTACH_CARD_QSS_DARK if self._is_dark else _ATTACH_CARD_QSS_LIGHT)
         card.setObjectName("attachCard")
 
         layout = QHBoxLayout(card)
@@ -921,8 +1181,10 @@ class ComposeWidget(QWidget):
         info_layout.addWidget(name_label)
 
         # Size
-        content = attachment.get('content', b'')
-        size = len(content) if isinstance(content, bytes) else len(content.encode('utf-8') if content else b'')
+        size = attachment.get('size')
+        if size is None:
+            content = attachment.get('content', b'')
+            size = len(content) if isinstance(content, bytes) else len(content.encode('utf-8') if content else b'')
         size_label = QLabel(self._format_file_size(size))
         size_color = "#777" if self._is_dark else "#888"
         size_label.setStyleSheet(f"color: {size_color}; font-size: 11px; background: transparent; border: none;")
@@ -936,22 +1198,7 @@ class ComposeWidget(QWidget):
         menu_btn.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup)
         menu_btn.setFixedSize(24, 24)
 
-        btn_style = f"""
-            QToolButton {{
-                background: transparent;
-                border: none;
-                font-size: 10px;
-                color: {'#888' if self._is_dark else '#666'};
-            }}
-            QToolButton:hover {{
-                background-color: {'#4c5052' if self._is_dark else '#ddd'};
-                border-radius: 4px;
-            }}
-            QToolButton::menu-indicator {{
-                image: none;
-            }}
-        """
-        menu_btn.setStyleSheet(btn_style)
+        menu_btn.setStyleSheet(_ATTACH_MENU_BTN_QSS_DARK if self._is_dark else _ATTACH_MENU_BTN_QSS_LIGHT)
 
         menu = QMenu(menu_btn)
 
@@ -964,52 +1211,9 @@ class ComposeWidget(QWidget):
 
         return card
 
-    def _html_to_plain_text(self, html_body):
-        """Convert HTML to plain text, properly stripping style/script blocks."""
-        if not html_body:
-            return ""
-
-        text = html_body
-
-        # Remove style and script blocks entirely (including their content)
-        text = re.sub(r'<style[^>]*>.*?</style>', '', text, flags=re.IGNORECASE | re.DOTALL)
-        text = re.sub(r'<script[^>]*>.*?</script>', '', text, flags=re.IGNORECASE | re.DOTALL)
-        text = re.sub(r'<head[^>]*>.*?</head>', '', text, flags=re.IGNORECASE | re.DOTALL)
-
-        # Convert common block elements to newlines
-        text = re.sub(r'<br\s*/?>', '\n', text, flags=re.IGNORECASE)
-        text = re.sub(r'<p[^>]*>', '\n', text, flags=re.IGNORECASE)
-        text = re.sub(r'</p>', '\n', text, flags=re.IGNORECASE)
-        text = re.sub(r'<div[^>]*>', '\n', text, flags=re.IGNORECASE)
-        text = re.sub(r'</div>', '', text, flags=re.IGNORECASE)
-        text = re.sub(r'<tr[^>]*>', '\n', text, flags=re.IGNORECASE)
-        text = re.sub(r'<li[^>]*>', '\n• ', text, flags=re.IGNORECASE)
-
-        # Strip remaining tags
-        text = re.sub(r'<[^>]+>', '', text)
-
-        # Decode HTML entities
-        text = html_module.unescape(text)
-
-        # Clean up whitespace
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        text = re.sub(r'[ \t]+', ' ', text)
-        lines = [line.strip() for line in text.split('\n')]
-        text = '\n'.join(lines).strip()
-
-        return text
-
     def _get_signature_html(self):
         """Get signature formatted as HTML."""
-        if not self._signature:
-            return ""
-        # Signature may be HTML or plain text
-        sig = self._signature
-        if '<' not in sig:
-            # Plain text - escape and convert newlines
-            sig = html_module.escape(sig).replace('\n', '<br>')
-        # Return signature as-is - QTextEdit should handle <font> tags
-        return f'<p><br></p>{sig}'
+        return _signature_html(self._signature)
 
     def _setup_new_message(self):
         """Setup for new message with signature."""
@@ -1056,16 +1260,16 @@ class ComposeWidget(QWidget):
             original_to = original_message.get('to', '')
             original_cc = original_message.get('cc', '')
 
-            for addr in (original_to + ',' + original_cc).split(','):
-                addr = addr.strip()
-                if not addr:
+            # Skip ourselves, the sender (already in To) and repeats
+            excluded = {my_email, from_email.lower()} - {''}
+            for name, addr_email in getaddresses([original_to, original_cc]):
+                if not addr_email:
                     continue
-                addr_lower = addr.lower()
-                if my_email and my_email in addr_lower:
+                addr_email_lower = addr_email.lower()
+                if addr_email_lower in excluded:
                     continue
-                if from_email and from_email.lower() in addr_lower:
-                    continue
-                cc_list.append(addr)
+                excluded.add(addr_email_lower)
+                cc_list.append(_format_address(name, addr_email))
 
             if cc_list:
                 self.cc_edit.setText(', '.join(cc_list))
@@ -1081,14 +1285,7 @@ class ComposeWidget(QWidget):
         body_type = original_message.get('body_type', 'text')
         date = original_message.get('date', '')
 
-        if date and len(date) >= 15:
-            try:
-                date_part = date[:8]
-                time_part = date[9:15]
-                dt = datetime.strptime(f"{date_part}{time_part}", "%Y%m%d%H%M%S")
-                date = dt.strftime("%B %d, %Y at %I:%M %p")
-            except Exception:
-                pass
+        date = _format_quote_date(date)
 
         sender_str = f"{from_name} &lt;{from_email}&gt;" if from_name else html_module.escape(from_email)
         quote_header = f"On {date}, {sender_str} wrote:" if date else f"{sender_str} wrote:"
@@ -1096,23 +1293,11 @@ class ComposeWidget(QWidget):
         # Preserve HTML body or convert plain text to HTML
         if body_type == 'html':
             # Strip outer html/body tags but keep the content
-            body_html = orig_body
-            # Remove doctype, html, head, body tags but keep content
-            body_html = re.sub(r'<!DOCTYPE[^>]*>', '', body_html, flags=re.IGNORECASE)
-            body_html = re.sub(r'<html[^>]*>', '', body_html, flags=re.IGNORECASE)
-            body_html = re.sub(r'</html>', '', body_html, flags=re.IGNORECASE)
-            body_html = re.sub(r'<head[^>]*>.*?</head>', '', body_html, flags=re.IGNORECASE | re.DOTALL)
-            body_html = re.sub(r'<body[^>]*>', '', body_html, flags=re.IGNORECASE)
-            body_html = re.sub(r'</body>', '', body_html, flags=re.IGNORECASE)
             # Remove remote images only for QTextEdit - WebEngine can load them
-            if not self._use_webengine:
-                body_html = re.sub(r'<img[^>]*src\s*=\s*["\']https?://[^"\']*["\'][^>]*>', '', body_html, flags=re.IGNORECASE)
-            # Always remove about:blank images (blocked images)
-            body_html = re.sub(r'<img[^>]*src\s*=\s*["\']about:blank["\'][^>]*>', '', body_html, flags=re.IGNORECASE)
-            quoted_body = body_html.strip()
+            quoted_body = _html_body_content(orig_body, strip_remote_images=not self._use_webengine)
         else:
             # Convert plain text to HTML
-            plain_body = self._html_to_plain_text(orig_body)
+            plain_body = _html_to_plain_text(orig_body)
             quoted_body = html_module.escape(plain_body).replace('\n', '<br>')
 
         # Build HTML with table-based left border (QTextEdit doesn't support border-left CSS)
@@ -1142,7 +1327,6 @@ class ComposeWidget(QWidget):
         self._set_default_paragraph_format()
 
         # Use timer to ensure focus after widget is fully shown
-        from PySide6.QtCore import QTimer
         QTimer.singleShot(50, self.body_edit.setFocus)
 
     def _setup_forward(self, original_message):
@@ -1151,7 +1335,7 @@ class ComposeWidget(QWidget):
         self._title_label.setText(self._compose_type)
 
         subject = original_message.get('subject', '')
-        if not subject.lower().startswith('fwd:') and not subject.lower().startswith('fw:'):
+        if not subject.lower().startswith(('fwd:', 'fw:')):
             subject = f"Fwd: {subject}"
         self.subject_edit.setText(subject)
 
@@ -1163,14 +1347,7 @@ class ComposeWidget(QWidget):
         body = original_message.get('body', '')
         body_type = original_message.get('body_type', 'text')
 
-        if date and len(date) >= 15:
-            try:
-                date_part = date[:8]
-                time_part = date[9:15]
-                dt = datetime.strptime(f"{date_part}{time_part}", "%Y%m%d%H%M%S")
-                date = dt.strftime("%B %d, %Y at %I:%M %p")
-            except Exception:
-                pass
+        date = _format_quote_date(date)
 
         # Escape for HTML
         sender_str = f"{html_module.escape(from_name)} &lt;{html_module.escape(from_email)}&gt;" if from_name else html_module.escape(from_email)
@@ -1180,23 +1357,11 @@ class ComposeWidget(QWidget):
         # Preserve HTML body or convert plain text to HTML
         if body_type == 'html':
             # Strip outer html/body tags but keep the content
-            body_html = body
-            # Remove doctype, html, head, body tags but keep content
-            body_html = re.sub(r'<!DOCTYPE[^>]*>', '', body_html, flags=re.IGNORECASE)
-            body_html = re.sub(r'<html[^>]*>', '', body_html, flags=re.IGNORECASE)
-            body_html = re.sub(r'</html>', '', body_html, flags=re.IGNORECASE)
-            body_html = re.sub(r'<head[^>]*>.*?</head>', '', body_html, flags=re.IGNORECASE | re.DOTALL)
-            body_html = re.sub(r'<body[^>]*>', '', body_html, flags=re.IGNORECASE)
-            body_html = re.sub(r'</body>', '', body_html, flags=re.IGNORECASE)
             # Remove remote images only for QTextEdit - WebEngine can load them
-            if not self._use_webengine:
-                body_html = re.sub(r'<img[^>]*src\s*=\s*["\']https?://[^"\']*["\'][^>]*>', '', body_html, flags=re.IGNORECASE)
-            # Always remove about:blank images (blocked images)
-            body_html = re.sub(r'<img[^>]*src\s*=\s*["\']about:blank["\'][^>]*>', '', body_html, flags=re.IGNORECASE)
-            forwarded_body = body_html.strip()
+            forwarded_body = _html_body_content(body, strip_remote_images=not self._use_webengine)
         else:
             # Convert plain text to HTML
-            plain_body = self._html_to_plain_text(body)
+            plain_body = _html_to_plain_text(body)
             forwarded_body = html_module.escape(plain_body).replace('\n', '<br>')
 
         # Build HTML with table-based left border (QTextEdit doesn't support border-left CSS)
@@ -1246,11 +1411,7 @@ class ComposeWidget(QWidget):
 
         # Replace Qt's font-family declarations with web-safe fonts
         # Qt outputs things like: font-family:'Sans Serif'; or font-family:"Sans Serif";
-        html = re.sub(
-            r"font-family:['\"]?[^;'\"]+['\"]?;",
-            f"font-family: {font_stack};",
-            html
-        )
+        html = _FONT_FAMILY_RE.sub(f"font-family: {font_stack};", html)
 
         # Add inline style to body tag for clients that inherit from body
         if '<body' in html:
@@ -1259,18 +1420,8 @@ class ComposeWidget(QWidget):
             else:
                 html = html.replace('<body', f'<body style="font-family: {font_stack};"', 1)
 
-        # Add inline margin to p tags
-        html = re.sub(
-            r'<p([^>]*)style="([^"]*)"',
-            r'<p\1style="margin: 0.3em 0; \2"',
-            html
-        )
-        # Handle p tags without style attribute
-        html = re.sub(
-            r'<p(?![^>]*style=)([^>]*)>',
-            r'<p style="margin: 0.3em 0;"\1>',
-            html
-        )
+        # Add inline margin to p tags, styled or not, in one pass
+        html = _P_TAG_RE.sub(_p_with_margin, html)
 
         # Convert tab characters to non-breaking spaces (4 spaces per tab)
         html = html.replace('\t', '&nbsp;&nbsp;&nbsp;&nbsp;')
@@ -1319,24 +1470,31 @@ class ComposeWidget(QWidget):
             self._title_label.setText(self._compose_type)
 
     def _get_current_state(self):
-        """Get current state of all fields for change detection."""
-        if self._use_webengine:
-            body_html = self.body_edit.toHtmlSync()
-        else:
-            body_html = self.body_edit.toHtml()
+        """Get current state of the header fields for change detection.
+
+        The body is not captured: both editors track their own edits.
+        """
         return {
             'to': self.to_edit.text(),
             'cc': self.cc_edit.text(),
             'subject': self.subject_edit.text(),
-            'body': body_html,
             'from_idx': self.from_combo.currentIndex(),
             'attachments': len(self._attachments)
         }
 
     def _has_changes(self):
         """Check if any fields have changed from initial state."""
-        current = self._get_current_state()
-        return current != self._initial_state
+        initial = self._initial_state
+        # Cheap header checks first; the body (a WebEngine round-trip) last
+        if (self.to_edit.text() != initial['to']
+                or self.cc_edit.text() != initial['cc']
+                or self.subject_edit.text() != initial['subject']
+                or self.from_combo.currentIndex() != initial['from_idx']
+                or len(self._attachments) != initial['attachments']):
+            return True
+        if self._use_webengine:
+            return self.body_edit.isModifiedSync()
+        return self.body_edit.document().isModified()
 
     def _discard(self):
         """Discard message."""
@@ -1377,5 +1535,7 @@ class ComposeWidget(QWidget):
 
     def _apply_theme(self):
         """Apply dark/light theme - now using system defaults."""
-        # Clear any stylesheet - use system theme
-        self.setStyleSheet("")
+        # Clear any stylesheet - use system theme. Setting one, even an
+        # empty one, makes Qt re-polish the whole subtree, so skip when unset.
+        if self.styleSheet():
+            self.setStyleSheet("")